@@ -24,6 +24,14 @@ GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 GOOGLE_CUSTOM_SEARCH_API_KEY = os.getenv("GOOGLE_SEARCH_API_KEY")
 GOOGLE_CUSTOM_SEARCH_ENGINE_ID = os.getenv("GOOGLE_SEARCH_ENGINE_ID")
 
+# Fraud log write-ahead log directory (optional; logs are inserted directly when unset).
+# Safe to share between worker processes: each writes its own email_fraud_logs.<pid>.wal
+FRAUD_LOG_WAL_DIR = os.getenv("FRAUD_LOG_WAL_DIR")
+
+# Worker processes for decoding and scanning email bodies. Opt-in: the default 0
+# processes them in the server process; each worker adds a spawned interpreter
+EMAIL_PROCESS_WORKERS = int(os.getenv("EMAIL_PROCESS_WORKERS", "0"))
+
 # Gemini AI Configuration
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
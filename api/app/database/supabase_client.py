@@ -1,23 +1,67 @@
 import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+import httpx
 from supabase import create_client, Client
+from supabase.lib.client_options import SyncClientOptions
 from fastapi import HTTPException
 
+# Validated OAuth tokens per (user ID, provider), so Pub/Sub notifications and
+# email syncs do not SELECT user_oauth_tokens every time; updated on refresh
+# and on re-authentication in this process, and re-read after the TTL
+OAUTH_TOKEN_CACHE_SIZE = 1024
+OAUTH_TOKEN_CACHE_TTL = 300  # seconds
+_oauth_token_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_oauth_token_cache_lock = threading.Lock()
 
+
+def _cache_oauth_token(key: tuple, tokens: dict):
+    """Store validated tokens, evicting the least recently used entry when full."""
+    with _oauth_token_cache_lock:
+        _oauth_token_cache[key] = (tokens, time.monotonic())
+        _oauth_token_cache.move_to_end(key)
+        if len(_oauth_token_cache) > OAUTH_TOKEN_CACHE_SIZE:
+            _oauth_token_cache.popitem(last=False)
+
+
+@lru_cache(maxsize=1)
 def get_supabase_client() -> Client:
-    """Initialize and return Supabase client."""
+    """
+    Initialize and return the shared Supabase client.
+    
+    The client is created once per process and backed by a pooled keep-alive
+    HTTP transport, so TCP/TLS setup is not repeated on every request.
+    """
     SUPABASE_URL = os.getenv("SUPABASE_URL")
     SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
 
     if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
         raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY environment variables are required")
 
-    return create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+    http_client = httpx.Client(
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        timeout=30
+    )
+
+    return create_client(
+        SUPABASE_URL,
+        SUPABASE_SERVICE_KEY,
+        options=SyncClientOptions(httpx_client=http_client)
+    )
 
 
 async def get_user_oauth_token(user_uuid: str, provider: str = 'google'):
     """
     Retrieve the user's OAuth tokens from the public.user_oauth_tokens table.
     """
+    cache_key = (user_uuid, provider)
+    with _oauth_token_cache_lock:
+        cached = _oauth_token_cache.get(cache_key)
+    if cached and time.monotonic() - cached[1] < OAUTH_TOKEN_CACHE_TTL:
+        return dict(cached[0])
+    
     supabase = get_supabase_client()
     
     try:
@@ -55,11 +99,13 @@ async def get_user_oauth_token(user_uuid: str, provider: str = 'google'):
                 detail="User has not granted Gmail permissions. Please re-authenticate with Gmail access."
             )
         
-        return {
+        tokens = {
             'access_token': access_token,
             'refresh_token': refresh_token,
             'scopes': scopes
         }
+        _cache_oauth_token(cache_key, tokens)
+        return dict(tokens)
     
     except HTTPException:
         raise
@@ -86,6 +132,12 @@ async def update_user_access_token(user_uuid: str, provider: str, new_access_tok
         }).eq('user_id', user_uuid).eq('provider', provider).execute()
         
         if response.data:
+            # Keep serving the refreshed token without re-reading it
+            cache_key = (user_uuid, provider)
+            with _oauth_token_cache_lock:
+                cached = _oauth_token_cache.get(cache_key)
+            if cached:
+                _cache_oauth_token(cache_key, {**cached[0], 'access_token': new_access_token})
             return {
                 'success': True,
                 'message': 'Access token updated successfully'
@@ -133,6 +185,10 @@ async def store_user_oauth_token(user_uuid: str, provider: str, access_token: st
             on_conflict='user_id,provider'
         ).execute()
         
+        # New tokens (and possibly scopes) are re-validated on the next read
+        with _oauth_token_cache_lock:
+            _oauth_token_cache.pop((user_uuid, provider), None)
+        
         if response.data:
             return {
                 'success': True,
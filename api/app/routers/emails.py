@@ -10,9 +10,14 @@ from app.services import (
     batch_get_profile_pictures,
     apply_gmail_label
 )
+from app.services.gmail_service import INVOICE_TERMS, INVOICE_PHRASES
+from app.services.gmail_async import close_client as close_gmail_http_client
 
 router = APIRouter(prefix="/emails", tags=["emails"])
 
+# Terms the Gmail invoice query searches for, reported back to clients
+SEARCH_TERMS = list(INVOICE_TERMS + INVOICE_PHRASES)
+
 
 @router.post("/test")
 async def test_email_structure(request: EmailRequest, token: str = Depends(verify_token)):
@@ -24,7 +29,7 @@ async def test_email_structure(request: EmailRequest, token: str = Depends(verif
         "message": "Test invoice-related emails (mock data)",
         "user_uuid": request.user_uuid,
         "email_count": 3,
-        "search_terms": ["invoice", "bill", "receipt", "payment", "due", "statement", "charge", "billing", "subscription", "renewal"],
+        "search_terms": SEARCH_TERMS,
         "emails": [
             {
                 "id": "mock_email_1",
@@ -87,13 +92,13 @@ async def fetch_user_emails(request: EmailRequest, token: str = Depends(verify_t
             print(f"Updated refreshed access token for user {request.user_uuid}")
         
         # Fetch emails from the past 3 months
-        emails = await get_user_emails(gmail_service, days_back=90, include_attachments=True)
+        emails = await get_user_emails(gmail_service, days_back=90, include_attachments=True, creds=creds)
         
         return {
             "message": "Invoice-related emails fetched successfully",
             "user_uuid": request.user_uuid,
             "email_count": len(emails),
-            "search_terms": ["invoice", "bill", "receipt", "payment", "due", "statement", "charge", "billing", "subscription", "renewal"],
+            "search_terms": SEARCH_TERMS,
             "emails": emails
         }
         
@@ -185,7 +190,8 @@ async def test_attachments(request: EmailRequest, token: str = Depends(verify_to
         emails = await get_user_emails(
             gmail_service, 
             days_back=90,
-            include_attachments=True
+            include_attachments=True,
+            creds=creds
         )
         
         # Analyze attachments
@@ -287,7 +293,9 @@ def process_billers_background(user_uuid: str, oauth_tokens: dict):
             emails = await get_user_emails(
                 gmail_service, 
                 days_back=90,
-                include_attachments=True
+                include_attachments=True,
+                creds=creds,
+                include_full_body=True
             )
             
             if not emails:
@@ -336,20 +344,27 @@ def process_billers_background(user_uuid: str, oauth_tokens: dict):
             import traceback
             traceback.print_exc()
     
+    async def process_on_own_loop():
+        try:
+            await async_process()
+        finally:
+            # The Gmail HTTP client is per event loop; close the one this loop created
+            await close_gmail_http_client()
+    
     # Run the async function in a new event loop (background thread safe)
     try:
         loop = asyncio.get_event_loop()
         if loop.is_running():
-            # If loop is running, create task
+            # If loop is running, create task (the server loop keeps its shared client)
             asyncio.create_task(async_process())
         else:
             # If no running loop, run it
-            loop.run_until_complete(async_process())
+            loop.run_until_complete(process_on_own_loop())
     except RuntimeError:
         # Create new event loop if needed
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        loop.run_until_complete(async_process())
+        loop.run_until_complete(process_on_own_loop())
         loop.close()
 
 
@@ -8,6 +8,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 from typing import Dict, Any, Optional, List
 from pydantic import BaseModel
+import asyncio
 import os
 
 from ..auth import verify_token
@@ -25,6 +26,9 @@ from ..database.supabase_client import get_supabase_client
 router = APIRouter(prefix="/fraud", tags=["fraud-detection"])
 security = HTTPBearer()
 
+# Emails analyzed at once by /analyze-batch (bounded by Gemini and Supabase limits)
+BATCH_ANALYSIS_CONCURRENCY = 8
+
 
 class EmailAnalysisRequest(BaseModel):
     """Request model for single email analysis."""
@@ -73,12 +77,18 @@ async def analyze_email_for_fraud(
         supabase = get_supabase_client()
         fraud_logger = create_fraud_logger(supabase)
         
-        # Perform fraud analysis with logging
-        result = await check_billing_email_legitimacy(
-            gmail_msg=request.gmail_message,
-            user_uuid=request.user_uuid,
-            fraud_logger=fraud_logger
-        )
+        # Perform fraud analysis with logging (steps written in one insert by the
+        # background writer, off the event loop)
+        fraud_logger.start_writer()
+        try:
+            with fraud_logger.buffered():
+                result = await check_billing_email_legitimacy(
+                    gmail_msg=request.gmail_message,
+                    user_uuid=request.user_uuid,
+                    fraud_logger=fraud_logger
+                )
+        finally:
+            await fraud_logger.drain()
         
         # Extract email ID
         email_id = request.gmail_message.get("id", "unknown")
@@ -130,16 +140,20 @@ async def analyze_emails_batch(
         # Get Supabase client
         supabase = get_supabase_client()
         fraud_logger = create_fraud_logger(supabase)
-        
-        results = []
-        for gmail_message in request.gmail_messages:
-            result = check_billing_email_legitimacy(
-                gmail_msg=gmail_message,
-                user_uuid=request.user_uuid,
-                fraud_logger=fraud_logger
-            )
+        fraud_logger.start_writer()
+        
+        # Analyze emails concurrently, a bounded number at a time
+        semaphore = asyncio.Semaphore(BATCH_ANALYSIS_CONCURRENCY)
+        
+        async def analyze_one(gmail_message: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                result = await check_billing_email_legitimacy(
+                    gmail_msg=gmail_message,
+                    user_uuid=request.user_uuid,
+                    fraud_logger=fraud_logger
+                )
             
-            results.append({
+            return {
                 "email_id": gmail_message.get("id", "unknown"),
                 "is_billing": result["is_billing"],
                 "email_type": result["email_type"],
@@ -147,7 +161,15 @@ async def analyze_emails_batch(
                 "confidence": result["confidence"],
                 "reasoning": result["reasoning"],
                 "log_entries": result.get("log_entries", [])
-            })
+            }
+        
+        try:
+            with fraud_logger.buffered():
+                results = await asyncio.gather(
+                    *(analyze_one(gmail_message) for gmail_message in request.gmail_messages)
+                )
+        finally:
+            await fraud_logger.drain()
         
         return {"results": results}
         
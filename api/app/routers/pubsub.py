@@ -8,7 +8,7 @@ from datetime import datetime
 from app.database import get_user_oauth_token, update_user_access_token
 from app.database.gmail_watch import get_gmail_watch
 from app.database.supabase_client import get_supabase_client
-from app.services import create_gmail_service, get_email_attachments, move_email_to_spam
+from app.services import create_gmail_service, get_email_attachments, move_email_to_spam, move_emails_to_spam_bulk
 from app.services.attachment_parser import process_attachments
 from app.services.fraud_logger import create_fraud_logger
 from app.services.invoice_extractor import extract_invoice_data
@@ -21,6 +21,22 @@ from domain_checker import is_billing_email, classify_email_type_with_gemini, an
 
 router = APIRouter(prefix="/pubsub", tags=["pubsub"])
 
+# Fraudulent messages moved to spam per batchModify call; pending moves are also
+# sent when the notification finishes or fails, so none are left in the inbox
+SPAM_MOVE_BATCH_SIZE = 10
+
+
+def _move_pending_to_spam(gmail_service, spam_message_ids: list):
+    """Move the collected fraudulent messages to spam in one call and clear the list."""
+    if not spam_message_ids:
+        return
+    
+    print(f"   📤 Moving {len(spam_message_ids)} fraudulent emails to spam...")
+    spam_result = move_emails_to_spam_bulk(gmail_service, spam_message_ids)
+    if spam_result['success']:
+        print(f"   ✅ Emails moved to spam successfully")
+    spam_message_ids.clear()
+
 
 class PubSubMessage(BaseModel):
     """Pub/Sub push notification message format."""
@@ -45,6 +61,9 @@ async def process_new_email_background(user_id: str, history_id: str, email_addr
         history_id: Gmail history ID from notification
         email_address: User's email address from notification
     """
+    gmail_service = None
+    fraud_logger = None
+    spam_message_ids = []
     try:
         print(f"🔔 Processing new email notification for user {user_id}")
         print(f"   Email: {email_address}, History ID: {history_id}")
@@ -120,7 +139,9 @@ async def process_new_email_background(user_id: str, history_id: str, email_addr
         
         # Setup EmailFraudLogger for this user
         supabase = get_supabase_client()
-        fraud_logger = create_fraud_logger(supabase)
+        # Buffered: each message's steps are flushed in one insert below
+        fraud_logger = create_fraud_logger(supabase, buffered=True)
+        fraud_logger.start_writer()
         
         # Process each new message through fraud detection pipeline
         for message_id in new_message_ids:
@@ -167,12 +188,10 @@ async def process_new_email_background(user_id: str, history_id: str, email_addr
                     print(f"         Reasons: {', '.join(domain_analysis['reasons'])}")
                     print(f"         Confidence: {domain_analysis['confidence']}")
                     
-                    # Move to spam/junk
-                    print(f"      📤 Moving email to spam...")
-                    spam_result = move_email_to_spam(gmail_service, message_id)
-                    
-                    if spam_result['success']:
-                        print(f"      ✅ Email moved to spam successfully")
+                    # Move to spam/junk (batched with other fraudulent messages)
+                    spam_message_ids.append(message_id)
+                    if len(spam_message_ids) >= SPAM_MOVE_BATCH_SIZE:
+                        _move_pending_to_spam(gmail_service, spam_message_ids)
                     
                     # Pull attachments for record keeping
                     attachments = get_email_attachments(gmail_service, message_id)
@@ -421,6 +440,14 @@ async def process_new_email_background(user_id: str, history_id: str, email_addr
                 import traceback
                 traceback.print_exc()
                 continue
+            finally:
+                # Write this message's buffered fraud log steps in one insert
+                try:
+                    fraud_logger.flush(message_id)
+                except Exception as log_err:
+                    print(f"   ⚠️  Failed to write fraud logs for {message_id}: {log_err}")
+        
+        _move_pending_to_spam(gmail_service, spam_message_ids)
         
         # Update stored history ID
         if history_response.get('historyId'):
@@ -437,6 +464,16 @@ async def process_new_email_background(user_id: str, history_id: str, email_addr
         print(f"❌ Error processing notification for user {user_id}: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        # Emails already judged fraudulent still leave the inbox if processing stopped early
+        _move_pending_to_spam(gmail_service, spam_message_ids)
+        
+        # Wait for queued fraud logs to be written and stop the writer, even on failure
+        if fraud_logger is not None:
+            try:
+                await fraud_logger.drain()
+            except Exception as log_err:
+                print(f"   ⚠️  Failed to write fraud logs: {log_err}")
 
 
 @router.post("/gmail/push")
@@ -757,7 +794,7 @@ async def process_test_email_background(user_id: str, user_email: str, mock_mess
                 
                 # Search for company information online
                 from app.services.google_search_service import google_search_service
-                search_results = google_search_service.search_company_info(company_name)
+                search_results = await google_search_service.search_company_info_async(company_name)
                 
                 if search_results.get('success'):
                     # Extract company attributes
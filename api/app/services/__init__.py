@@ -1,12 +1,14 @@
 from .gmail_service import (
     create_gmail_service, 
     get_user_emails, 
+    iter_user_emails,
     extract_email_body, 
     get_email_attachments, 
     get_user_email_address,
     get_sender_profile_picture,
     batch_get_profile_pictures,
     move_email_to_spam,
+    move_emails_to_spam_bulk,
     apply_gmail_label,
     get_or_create_gmail_label
 )
@@ -17,12 +19,14 @@ from .gmail_watch import setup_gmail_watch, stop_gmail_watch, should_renew_watch
 __all__ = [
     "create_gmail_service", 
     "get_user_emails", 
+    "iter_user_emails",
     "extract_email_body", 
     "get_email_attachments", 
     "get_user_email_address", 
     "get_sender_profile_picture",
     "batch_get_profile_pictures",
     "move_email_to_spam",
+    "move_emails_to_spam_bulk",
     "apply_gmail_label",
     "get_or_create_gmail_label",
     "BillerExtractor",
@@ -1,23 +1,28 @@
-import base64
+import pybase64
 import io
 from typing import Dict, List
 from PyPDF2 import PdfReader
 
 
-def extract_text_from_pdf(pdf_data: str) -> str:
+def extract_text_from_pdf(pdf_data: str = None, path: str = None) -> str:
     """
-    Extract text from a base64-encoded PDF attachment.
+    Extract text from a base64-encoded PDF attachment or a PDF saved to disk.
     
     Args:
         pdf_data: Base64-encoded PDF data
+        path: Path of the PDF file (used instead of pdf_data when given)
         
     Returns:
         Extracted text content
     """
     try:
-        # Decode base64 data
-        pdf_bytes = base64.urlsafe_b64decode(pdf_data)
-        pdf_file = io.BytesIO(pdf_bytes)
+        if path:
+            # PdfReader reads pages from the file as needed
+            pdf_file = path
+        else:
+            # Decode base64 data
+            pdf_bytes = pybase64.urlsafe_b64decode(pdf_data)
+            pdf_file = io.BytesIO(pdf_bytes)
         
         # Read PDF
         reader = PdfReader(pdf_file)
@@ -36,12 +41,21 @@ def extract_text_from_pdf(pdf_data: str) -> str:
         return ""
 
 
+def _attachment_bytes(attachment: Dict) -> bytes:
+    """Raw attachment content, from its file if it was saved to disk."""
+    if attachment.get('path'):
+        with open(attachment['path'], 'rb') as f:
+            return f.read()
+    return pybase64.urlsafe_b64decode(attachment.get('data', ''))
+
+
 def extract_text_from_attachment(attachment: Dict) -> str:
     """
     Extract text from an email attachment based on its MIME type.
     
     Args:
-        attachment: Attachment dictionary with filename, mime_type, and data
+        attachment: Attachment dictionary with filename, mime_type, and
+            either data (base64) or path (saved by get_email_attachments)
         
     Returns:
         Extracted text content
@@ -49,18 +63,19 @@ def extract_text_from_attachment(attachment: Dict) -> str:
     mime_type = attachment.get('mime_type', '').lower()
     filename = attachment.get('filename', '').lower()
     data = attachment.get('data', '')
+    path = attachment.get('path')
     
-    if not data:
+    if not data and not path:
         return ""
     
     # Handle PDFs
     if 'pdf' in mime_type or filename.endswith('.pdf'):
-        return extract_text_from_pdf(data)
+        return extract_text_from_pdf(data, path=path)
     
     # Handle plain text
     elif 'text/plain' in mime_type or filename.endswith('.txt'):
         try:
-            text_bytes = base64.urlsafe_b64decode(data)
+            text_bytes = _attachment_bytes(attachment)
             return text_bytes.decode('utf-8', errors='ignore')
         except:
             return ""
@@ -69,7 +84,7 @@ def extract_text_from_attachment(attachment: Dict) -> str:
     elif 'text/html' in mime_type or filename.endswith('.html'):
         try:
             from bs4 import BeautifulSoup
-            html_bytes = base64.urlsafe_b64decode(data)
+            html_bytes = _attachment_bytes(attachment)
             html_text = html_bytes.decode('utf-8', errors='ignore')
             soup = BeautifulSoup(html_text, 'html.parser')
             return soup.get_text(separator='\n', strip=True)
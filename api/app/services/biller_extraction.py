@@ -462,10 +462,11 @@ Example:
             )
             response_text = response.text
             
-            # Try to find JSON in the response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                biller_data = json.loads(json_match.group())
+            # Try to find JSON in the response (first '{' to last '}')
+            start = response_text.find('{')
+            end = response_text.rfind('}')
+            if start != -1 and end > start:
+                biller_data = json.loads(response_text[start:end + 1])
             else:
                 biller_data = json.loads(response_text)
             
@@ -5,15 +5,20 @@ This service handles phone verification calls using ElevenLabs Conversational AI
 It dynamically injects user information from the database into the agent's system prompt.
 """
 
+import asyncio
 import os
 import json
 import time
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Separators stripped from phone numbers in one translate pass
+PHONE_FORMATTING_CHARS = str.maketrans('', '', ' -()')
+
 
 class ElevenLabsAgent:
     """Service for ElevenLabs agent phone verification calls."""
@@ -87,6 +92,10 @@ IMPORTANT:
         self.phone_number_id = os.getenv('ELEVENLABS_PHONE_NUMBER_ID', 'phnum_4801k6sa89eqfpnsfjsxbr40phen')
         self.base_url = "https://api.elevenlabs.io/v1/convai"
         
+        # Keep-alive connections to ElevenLabs reused across calls and status checks
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=32))
+        
         if not self.api_key:
             logger.warning("ElevenLabs API key not configured")
     
@@ -101,7 +110,7 @@ IMPORTANT:
             str: Formatted phone number
         """
         # Remove all non-digit characters
-        phone = phone_number.strip().replace(" ", "").replace("-", "").replace("(", "").replace(")", "")
+        phone = phone_number.strip().translate(PHONE_FORMATTING_CHARS)
         
         # Add country code if missing
         if not phone.startswith("+"):
@@ -129,17 +138,19 @@ IMPORTANT:
             supabase = get_supabase_client()
             
             # Fetch user profile
-            response = supabase.table('profiles')\
-                .select('*')\
-                .eq('id', user_uuid)\
-                .execute()
+            response = await asyncio.to_thread(
+                supabase.table('profiles')
+                .select('*')
+                .eq('id', user_uuid)
+                .execute
+            )
             
             if response.data and len(response.data) > 0:
                 profile = response.data[0]
                 
                 # Also fetch user email from auth if available
                 try:
-                    auth_response = supabase.auth.admin.get_user_by_id(user_uuid)
+                    auth_response = await asyncio.to_thread(supabase.auth.admin.get_user_by_id, user_uuid)
                     user_email = auth_response.user.email if auth_response.user else None
                 except:
                     user_email = None
@@ -308,8 +319,10 @@ IMPORTANT:
             for key, value in dynamic_variables.items():
                 print(f"      • {key}: {value}")
             
-            # Make the API call
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            # Make the API call (blocking session, run off the event loop)
+            response = await asyncio.to_thread(
+                self.session.post, url, headers=headers, json=payload, timeout=30
+            )
             
             logger.info(f"ElevenLabs API response status: {response.status_code}")
             
@@ -409,7 +422,7 @@ IMPORTANT:
             url = f"{self.base_url}/conversations/{conversation_id}"
             headers = {"xi-api-key": self.api_key}
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = await asyncio.to_thread(self.session.get, url, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 return {
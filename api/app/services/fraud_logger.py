@@ -5,119 +5,353 @@ This module provides functions to log fraud detection decisions
 at each step of the analysis pipeline.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
+from collections import defaultdict
+from contextlib import contextmanager
+import asyncio
+import fcntl
+import glob
+import os
+import threading
 from datetime import datetime
 from supabase import Client
+from postgrest import ReturnMethod
 import json
+import orjson
+from app.config import FRAUD_LOG_WAL_DIR
+
+
+# Background writer batching: flush after this many entries or this many seconds
+WRITER_BATCH_SIZE = 100
+WRITER_BATCH_TIMEOUT = 0.05
+
+# Local write-ahead log (enabled by FRAUD_LOG_WAL_DIR): fsync after this many
+# appended entries, ship to Supabase this often (seconds), and start a new
+# segment once a fully shipped file reaches this size
+WAL_FSYNC_EVERY = 32
+WAL_SHIP_INTERVAL = 1.0
+WAL_SEGMENT_SIZE = 64 * 1024 * 1024
+
+# details keys also written to their own indexed columns
+PROMOTED_DETAIL_COLUMNS = ("status", "email_type", "trigger_agent")
+
+
+# Final decision per (is_billing, email_type, is_legitimate, verification_status).
+# Fields that do not affect the outcome are normalised to None by
+# _final_decision_key, so each row covers every value of them.
+FINAL_DECISIONS = {
+    # Not billing-related, halt processing
+    (False, None, None, None): (False, "Not billing-related: {email_type}"),
+    # Receipts are safe, proceed
+    (True, "receipt", None, None): (True, "Receipt detected: {reasoning}"),
+    # For bills, check both domain legitimacy and verification status
+    (True, "bill", False, None): (False, "Bill analysis: Suspicious domain"),
+    (True, "bill", True, "legit"): (
+        True, "Bill analysis: Legitimate domain and verified company (phone + address match)"
+    ),
+    # Halt processing, but trigger agent for phone verification
+    (True, "bill", True, "call"): (
+        False, "Bill analysis: Phone verified, trigger agent for address verification"
+    ),
+    (True, "bill", True, "pending"): (
+        False, "Bill analysis: Insufficient verification data, requires human review"
+    ),
+    # Unknown type, halt
+    (True, "other", None, None): (False, "Unknown email type: {email_type}"),
+}
+
+
+class _OrjsonSession:
+    """Forwards a postgrest request to its httpx client with the JSON body encoded by orjson."""
+    
+    def __init__(self, session):
+        self._session = session
+    
+    def request(self, method: str, url: str, *, json: Any = None, **kwargs):
+        if json is not None:
+            kwargs["content"] = orjson.dumps(json, option=orjson.OPT_NON_STR_KEYS)
+            kwargs["headers"] = {**kwargs.get("headers", {}), "Content-Type": "application/json"}
+        return self._session.request(method, url, **kwargs)
+
+
+def _final_decision_key(final_result: Dict[str, Any]) -> tuple:
+    """Reduce a pipeline result to its FINAL_DECISIONS key."""
+    if not final_result["is_billing"]:
+        return (False, None, None, None)
+    
+    email_type = final_result["email_type"]
+    if email_type != "bill":
+        return (True, email_type if email_type == "receipt" else "other", None, None)
+    
+    is_legitimate = bool(final_result.get("is_legitimate", True))
+    if not is_legitimate:
+        return (True, "bill", False, None)
+    
+    verification_status = final_result.get("verification_status", "pending")
+    if verification_status not in ("legit", "call"):
+        verification_status = "pending"
+    return (True, "bill", True, verification_status)
 
 
 class EmailFraudLogger:
-    """Handles logging of fraud detection decisions to the database."""
+    """
+    Handles logging of fraud detection decisions to the database.
     
-    def __init__(self, supabase_client: Client):
+    Each pipeline step is written as it is logged. Inside buffered() (or with
+    buffered=True) steps are instead held in memory per email and written with
+    a single bulk insert when the email is flushed: log_final_decision flushes
+    its email, leaving buffered() flushes the rest, and buffered=True callers
+    must call flush() themselves.
+    
+    Inside an event loop, call start_writer() to move those inserts onto a
+    background task, and await drain() before the work is considered done.
+    Steps may be logged from worker threads (asyncio.to_thread) as well as
+    from the loop.
+    """
+    
+    def __init__(self, supabase_client: Client, buffered: bool = False):
         self.supabase = supabase_client
+        self._buffering = buffered
+        self._pending: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._pending_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+    
+    def start_writer(self) -> None:
+        """Start the background writer task on the running event loop."""
+        if self._writer is None:
+            self._loop = asyncio.get_running_loop()
+            self._queue = asyncio.Queue()
+            self._writer = self._loop.create_task(self._writer_loop())
+    
+    @contextmanager
+    def buffered(self):
+        """Buffer log entries per email inside the block and flush them all on exit, even on error."""
+        previous = self._buffering
+        self._buffering = True
+        try:
+            yield self
+        finally:
+            self._buffering = previous
+            if not previous:
+                self.flush()
+    
+    async def drain(self) -> None:
+        """Queue any remaining buffered entries, wait for them to be written and stop the writer."""
+        self.flush()
+        if self._writer is None:
+            return
+        
+        await self._queue.join()
+        self._writer.cancel()
+        self._writer = None
+        self._queue = None
+        self._loop = None
+    
+    async def _writer_loop(self) -> None:
+        """Collect queued entries into batches and insert each batch in one call."""
+        while True:
+            batch = list(await self._queue.get())
+            received = 1
+            
+            while len(batch) < WRITER_BATCH_SIZE:
+                try:
+                    batch.extend(await asyncio.wait_for(self._queue.get(), timeout=WRITER_BATCH_TIMEOUT))
+                    received += 1
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await asyncio.to_thread(self._insert_batch, batch)
+            except Exception as e:
+                print(f"Warning: Failed to write {len(batch)} fraud log entries: {e}")
+            finally:
+                for _ in range(received):
+                    self._queue.task_done()
+    
+    def _insert_batch(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert log entries in a single bulk request and return them."""
+        # default_to_null=False lets rows missing optional keys (e.g. verification_status)
+        # fall back to column defaults, same as single-row inserts. return=minimal
+        # stops PostgREST echoing every inserted row back.
+        request = self.supabase.table("email_fraud_logs").insert(
+            entries, returning=ReturnMethod.minimal, default_to_null=False
+        )
+        # Serialize the body with orjson rather than httpx's stdlib json; details
+        # embeds the whole analysis result for final decisions. execute() still
+        # handles the response and raises postgrest's APIError.
+        request.session = _OrjsonSession(request.session)
+        request.execute()
+        
+        return entries
+    
+    def _enqueue(self, entries: List[Dict[str, Any]]) -> None:
+        """Hand entries to the background writer, from its loop or a worker thread."""
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        
+        if on_loop:
+            self._queue.put_nowait(entries)
+        else:
+            # asyncio.Queue is not thread-safe
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, entries)
+    
+    def _record(self, log_entry: Dict[str, Any], immediate: bool = False) -> Dict[str, Any]:
+        """Write a log entry, or buffer it for its email when buffering (unless immediate=True)."""
+        if self._buffering and not immediate:
+            with self._pending_lock:
+                self._pending[log_entry["email_id"]].append(log_entry)
+        elif self._queue is not None and not immediate:
+            self._enqueue([log_entry])
+        else:
+            self._insert_batch([log_entry])
+        return log_entry
+    
+    def flush(self, email_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Write buffered log entries to the database in one bulk insert.
+        
+        When the background writer is running the entries are queued for it
+        instead of waiting on the insert.
+        
+        Args:
+            email_id: Email to flush; flushes every buffered email if None
+            
+        Returns:
+            list: The written (or queued) log entries
+        """
+        with self._pending_lock:
+            if email_id is None:
+                entries = [entry for pending in self._pending.values() for entry in pending]
+                self._pending.clear()
+            else:
+                entries = self._pending.pop(email_id, [])
+        
+        if not entries:
+            return []
+        
+        if self._queue is not None:
+            self._enqueue(entries)
+            return entries
+        
+        return self._insert_batch(entries)
+    
+    def _insert(
+        self,
+        step: str,
+        email_id: str,
+        user_uuid: str,
+        decision: bool,
+        confidence: float,
+        reasoning: str,
+        details: Dict[str, Any],
+        immediate: bool = False,
+        verification_status: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build a pipeline log entry and record it."""
+        log_entry = {
+            "email_id": email_id,
+            "user_uuid": user_uuid,
+            "step": step,
+            "decision": decision,
+            "confidence": float(confidence),
+            "reasoning": reasoning,
+            "details": details
+        }
+        if verification_status is not None:
+            log_entry["verification_status"] = verification_status
+        for column in PROMOTED_DETAIL_COLUMNS:
+            if details.get(column) is not None:
+                log_entry[column] = details[column]
+        
+        return self._record(log_entry, immediate)
     
     def log_gemini_analysis(
         self, 
         email_id: str, 
         user_uuid: str, 
-        gemini_result: Dict[str, Any]
+        gemini_result: Dict[str, Any],
+        immediate: bool = False
     ) -> Dict[str, Any]:
         """Log Gemini AI analysis results."""
         # Decision: true if billing-related (bill or receipt), false if other
-        decision = gemini_result["is_billing"]
-        
-        log_entry = {
-            "email_id": email_id,
-            "user_uuid": user_uuid,
-            "step": "gemini_analysis",
-            "decision": decision,
-            "confidence": float(gemini_result["confidence"]),
-            "reasoning": f"Email type: {gemini_result['email_type']} - {gemini_result['reasoning']}",
-            "details": {
+        return self._insert(
+            "gemini_analysis", email_id, user_uuid,
+            decision=gemini_result["is_billing"],
+            confidence=gemini_result["confidence"],
+            reasoning=f"Email type: {gemini_result['email_type']} - {gemini_result['reasoning']}",
+            details={
                 "gemini_analysis": gemini_result,
                 "is_billing": gemini_result["is_billing"],
                 "email_type": gemini_result["email_type"]
-            }
-        }
-        
-        result = self.supabase.table("email_fraud_logs").insert(log_entry).execute()
-        return result.data[0] if result.data else None
+            },
+            immediate=immediate
+        )
     
     def log_domain_check(
         self, 
         email_id: str, 
         user_uuid: str, 
-        domain_result: Dict[str, Any]
+        domain_result: Dict[str, Any],
+        immediate: bool = False
     ) -> Dict[str, Any]:
         """Log domain analysis results."""
         # Decision: true if legitimate, false if suspicious
-        decision = domain_result["is_legitimate"]
-        reasoning = f"Domain analysis: {', '.join(domain_result['reasons']) if domain_result['reasons'] else 'No issues found'}"
-        
-        log_entry = {
-            "email_id": email_id,
-            "user_uuid": user_uuid,
-            "step": "domain_check",
-            "decision": decision,
-            "confidence": float(domain_result["confidence"]),
-            "reasoning": reasoning,
-            "details": {
+        return self._insert(
+            "domain_check", email_id, user_uuid,
+            decision=domain_result["is_legitimate"],
+            confidence=domain_result["confidence"],
+            reasoning=f"Domain analysis: {', '.join(domain_result['reasons']) if domain_result['reasons'] else 'No issues found'}",
+            details={
                 "domain_analysis": domain_result["domain_analysis"],
                 "is_legitimate": domain_result["is_legitimate"]
-            }
-        }
-        
-        result = self.supabase.table("email_fraud_logs").insert(log_entry).execute()
-        return result.data[0] if result.data else None
+            },
+            immediate=immediate
+        )
     
     def log_company_verification(
         self, 
         email_id: str, 
         user_uuid: str, 
-        company_result: Dict[str, Any]
+        company_result: Dict[str, Any],
+        immediate: bool = False
     ) -> Dict[str, Any]:
         """Log company verification results."""
         # Decision: true if company matches and attributes are same, false if different or not found
-        decision = company_result["is_verified"]
-        
-        log_entry = {
-            "email_id": email_id,
-            "user_uuid": user_uuid,
-            "step": "company_verification",
-            "decision": decision,
-            "confidence": float(company_result["confidence"]),
-            "reasoning": company_result["reasoning"],
-            "details": {
+        return self._insert(
+            "company_verification", email_id, user_uuid,
+            decision=company_result["is_verified"],
+            confidence=company_result["confidence"],
+            reasoning=company_result["reasoning"],
+            details={
                 "company_match": company_result.get("company_match"),
                 "attribute_differences": company_result.get("attribute_differences", []),
                 "is_verified": company_result["is_verified"],
                 "trigger_agent": company_result.get("trigger_agent", False)
-            }
-        }
-        
-        result = self.supabase.table("email_fraud_logs").insert(log_entry).execute()
-        return result.data[0] if result.data else None
+            },
+            immediate=immediate
+        )
     
     def log_online_verification(
         self, 
         email_id: str, 
         user_uuid: str, 
-        online_result: Dict[str, Any]
+        online_result: Dict[str, Any],
+        immediate: bool = False
     ) -> Dict[str, Any]:
         """Log online verification results from Google Search with new verification states."""
-        # Decision: true if verified (legit), false if needs review (call/pending)
-        decision = online_result.get("verification_status") == "legit"
+        verification_status = online_result.get("verification_status", "pending")
         
-        log_entry = {
-            "email_id": email_id,
-            "user_uuid": user_uuid,
-            "step": "online_verification",
-            "decision": decision,
-            "verification_status": online_result.get("verification_status", "pending"),
-            "confidence": float(online_result["confidence"]),
-            "reasoning": online_result["reasoning"],
-            "details": {
+        # Decision: true if verified (legit), false if needs review (call/pending)
+        return self._insert(
+            "online_verification", email_id, user_uuid,
+            decision=verification_status == "legit",
+            confidence=online_result["confidence"],
+            reasoning=online_result["reasoning"],
+            details={
                 "company_name": online_result.get("company_name"),
                 "search_query": online_result.get("search_query"),
                 "attribute_differences": online_result.get("attribute_differences", []),
@@ -130,12 +364,11 @@ class EmailFraudLogger:
                 "online_phone": online_result.get("online_phone"),
                 "extracted_address": online_result.get("extracted_address"),
                 "online_address": online_result.get("online_address"),
-                "verification_status": online_result.get("verification_status", "pending")
-            }
-        }
-        
-        result = self.supabase.table("email_fraud_logs").insert(log_entry).execute()
-        return result.data[0] if result.data else None
+                "verification_status": verification_status
+            },
+            immediate=immediate,
+            verification_status=verification_status
+        )
     
     def log_final_decision(
         self, 
@@ -143,56 +376,52 @@ class EmailFraudLogger:
         user_uuid: str, 
         final_result: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Log final fraud detection decision."""
+        """Log final fraud detection decision and flush all buffered steps for the email."""
         # Determine final decision based on email type and legitimacy
-        if not final_result["is_billing"]:
-            decision = False  # Not billing-related, halt processing
-            reasoning = f"Not billing-related: {final_result.get('email_type', 'other')}"
-        elif final_result["email_type"] == "receipt":
-            decision = True  # Receipts are safe, proceed
-            reasoning = f"Receipt detected: {final_result.get('reasoning', 'Safe confirmation')}"
-        elif final_result["email_type"] == "bill":
-            # For bills, check both domain legitimacy and verification status
-            if not final_result.get("is_legitimate", True):
-                decision = False
-                reasoning = "Bill analysis: Suspicious domain"
-            else:
-                # Check verification status from online verification
-                verification_status = final_result.get("verification_status", "pending")
-                if verification_status == "legit":
-                    decision = True
-                    reasoning = "Bill analysis: Legitimate domain and verified company (phone + address match)"
-                elif verification_status == "call":
-                    decision = False  # Halt processing, but trigger agent for phone verification
-                    reasoning = "Bill analysis: Phone verified, trigger agent for address verification"
-                else:  # pending
-                    decision = False
-                    reasoning = "Bill analysis: Insufficient verification data, requires human review"
+        decision_key = _final_decision_key(final_result)
+        decision, reasoning_template = FINAL_DECISIONS[decision_key]
+        reasoning = reasoning_template.format(
+            email_type=final_result.get("email_type", "other"),
+            reasoning=final_result.get("reasoning", "Safe confirmation")
+        )
+        
+        # Halted emails go to the call agent, wait for human review or are treated
+        # as fraud; non-billing emails are halted too but are not fraud
+        trigger_agent = final_result.get("trigger_agent", False)
+        if decision:
+            status = "legit"
+        elif trigger_agent:
+            status = "call"
+        elif not final_result["is_billing"]:
+            status = "not_billing"
+        elif decision_key == (True, "bill", True, "pending"):
+            status = "pending"
         else:
-            decision = False  # Unknown type, halt
-            reasoning = f"Unknown email type: {final_result.get('email_type', 'other')}"
+            status = "fraud"
         
-        log_entry = {
-            "email_id": email_id,
-            "user_uuid": user_uuid,
-            "step": "final_decision",
-            "decision": decision,
-            "verification_status": final_result.get("verification_status", "pending"),
-            "confidence": float(final_result["confidence"]),
-            "reasoning": reasoning,
-            "details": {
+        verification_status = final_result.get("verification_status", "pending")
+        log_entry = self._insert(
+            "final_decision", email_id, user_uuid,
+            decision=decision,
+            confidence=final_result["confidence"],
+            reasoning=reasoning,
+            details={
                 "complete_analysis": final_result,
                 "email_type": final_result.get("email_type"),
                 "is_legitimate": final_result.get("is_legitimate"),
-                "verification_status": final_result.get("verification_status", "pending"),
+                "verification_status": verification_status,
                 "phone_match": final_result.get("phone_match", False),
                 "address_match": final_result.get("address_match", False),
-                "halt_reason": final_result.get("halt_reason")
-            }
-        }
+                "halt_reason": final_result.get("halt_reason"),
+                "status": status,
+                "trigger_agent": trigger_agent
+            },
+            verification_status=verification_status
+        )
         
-        result = self.supabase.table("email_fraud_logs").insert(log_entry).execute()
-        return result.data[0] if result.data else None
+        # Final decision closes out the pipeline: write every buffered step at once
+        self.flush(email_id)
+        return log_entry
     
     def get_email_analysis_history(
         self, 
@@ -232,10 +461,7 @@ class EmailFraudLogger:
                 'details': change_data
             }
             
-            response = self.supabase.table('email_fraud_logs').insert(log_entry).execute()
-            
-            if response.data:
-                return response.data[0]
+            self._insert_batch([log_entry])
             return log_entry
             
         except Exception as e:
@@ -265,11 +491,12 @@ class EmailFraudLogger:
         limit: int = 50
     ) -> List[Dict[str, Any]]:
         """Get all emails marked as fraud for a user."""
+        # Only the listed columns; skips loading the full details jsonb per row
         result = self.supabase.table("email_fraud_logs")\
-            .select("*")\
+            .select("email_id,created_at,halt_reason:details->>halt_reason")\
             .eq("user_uuid", user_uuid)\
             .eq("step", "final_decision")\
-            .eq("decision", "fraud")\
+            .eq("status", "fraud")\
             .order("created_at", desc=True)\
             .limit(limit)\
             .execute()
@@ -277,6 +504,264 @@ class EmailFraudLogger:
         return result.data if result.data else []
 
 
-def create_fraud_logger(supabase_client: Client) -> EmailFraudLogger:
-    """Create a new EmailFraudLogger instance."""
-    return EmailFraudLogger(supabase_client)
+class FraudLogWAL:
+    """
+    Local append-only log of fraud log entries, shipped to Supabase in the background.
+    
+    Entries are appended as JSON lines and fsynced every WAL_FSYNC_EVERY entries
+    (and on every shipper tick). ship() inserts everything after the checkpoint,
+    a byte offset kept in a sibling .ckpt file, so entries that were written but
+    not yet shipped before a crash are replayed on the next ship. Once everything
+    has been shipped and the file is past WAL_SEGMENT_SIZE a new empty file is
+    renamed over it. The checkpoint records the inode it belongs to, so after that
+    rename (or a crash around it) the stale offset is ignored and the new file is
+    read from the start.
+    
+    Each process writes its own file (email_fraud_logs.<pid>.wal) and holds an
+    exclusive flock on it while running, so several workers can share the
+    directory. A file whose lock is free belongs to a process that has exited;
+    ship() replays it and deletes it.
+    """
+    
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.path = os.path.join(directory, f"email_fraud_logs.{os.getpid()}.wal")
+        self.checkpoint_path = self.path + ".ckpt"
+        while True:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            # A reused pid can race another process adopting (and deleting) the old file
+            try:
+                if os.stat(self.path).st_ino == os.fstat(self._fd).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            os.close(self._fd)
+        self._append_lock = threading.Lock()
+        self._ship_lock = threading.Lock()
+        self._unsynced = 0
+        self._shipper: Optional[asyncio.Task] = None
+        self._ship_insert: Optional[Callable[[List[Dict[str, Any]]], Any]] = None
+    
+    def append(self, entries: List[Dict[str, Any]]) -> None:
+        """Append entries to the log, fsyncing every WAL_FSYNC_EVERY entries."""
+        data = b"".join(
+            orjson.dumps(entry, option=orjson.OPT_NON_STR_KEYS) + b"\n" for entry in entries
+        )
+        with self._append_lock:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self._fd, view):]
+            
+            self._unsynced += len(entries)
+            if self._unsynced >= WAL_FSYNC_EVERY:
+                os.fsync(self._fd)
+                self._unsynced = 0
+    
+    def sync(self) -> None:
+        """Flush appended entries to disk."""
+        with self._append_lock:
+            if self._unsynced:
+                os.fsync(self._fd)
+                self._unsynced = 0
+    
+    @staticmethod
+    def _read_checkpoint(checkpoint_path: str, inode: int) -> int:
+        try:
+            with open(checkpoint_path, "rb") as f:
+                checkpoint_inode, offset = f.read().split()
+        except (FileNotFoundError, ValueError):
+            return 0
+        # A checkpoint for an earlier segment file does not apply to this one
+        return int(offset) if int(checkpoint_inode) == inode else 0
+    
+    @staticmethod
+    def _write_checkpoint(checkpoint_path: str, inode: int, offset: int) -> None:
+        # Write-then-rename so a crash never leaves a half-written checkpoint
+        tmp_path = checkpoint_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(f"{inode} {offset}".encode())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, checkpoint_path)
+    
+    def ship(self, insert_batch: Callable[[List[Dict[str, Any]]], Any]) -> int:
+        """
+        Insert every complete entry after the checkpoint and advance it.
+        
+        Files left by exited processes are shipped first and then deleted.
+        
+        Args:
+            insert_batch: Callable that writes a list of entries to Supabase
+            
+        Returns:
+            int: Number of entries shipped
+        """
+        with self._ship_lock:
+            shipped = self._ship_orphans(insert_batch)
+            
+            shipped_own, position = self._ship_file(self.path, self.checkpoint_path, insert_batch)
+            shipped += shipped_own
+            
+            # Start a new segment once the current one is fully shipped
+            with self._append_lock:
+                if position >= WAL_SEGMENT_SIZE and os.fstat(self._fd).st_size == position:
+                    self._start_segment()
+            
+            return shipped
+    
+    def _start_segment(self) -> None:
+        """Replace the fully shipped file with a new empty one; the append lock must be held."""
+        # One rename swaps the files, so a crash leaves either the old file with its
+        # matching checkpoint or the new file, which the old checkpoint does not match
+        new_path = self.path + ".new"
+        fd = os.open(new_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_TRUNC, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        os.replace(new_path, self.path)
+        os.close(self._fd)
+        self._fd = fd
+        self._unsynced = 0
+    
+    def _ship_orphans(self, insert_batch: Callable[[List[Dict[str, Any]]], Any]) -> int:
+        """Ship and delete WAL files left behind by processes that have exited."""
+        shipped = 0
+        for path in glob.glob(os.path.join(self.directory, "email_fraud_logs.*.wal")):
+            if path == self.path:
+                continue
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                continue
+            try:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # Owner is still running and ships it itself
+                    continue
+                # Another process may have adopted and deleted it, or a running owner
+                # renamed a new segment over it, before we got the lock
+                try:
+                    if os.stat(path).st_ino != os.fstat(fd).st_ino:
+                        continue
+                except FileNotFoundError:
+                    continue
+                
+                checkpoint_path = path + ".ckpt"
+                shipped += self._ship_file(path, checkpoint_path, insert_batch)[0]
+                os.unlink(path)
+                try:
+                    os.unlink(checkpoint_path)
+                except FileNotFoundError:
+                    pass
+            finally:
+                os.close(fd)
+        return shipped
+    
+    def _ship_file(self, path: str, checkpoint_path: str,
+                   insert_batch: Callable[[List[Dict[str, Any]]], Any]) -> tuple:
+        """Ship one WAL file from its checkpoint; returns (entries shipped, end offset)."""
+        with open(path, "rb") as f:
+            inode = os.fstat(f.fileno()).st_ino
+            offset = self._read_checkpoint(checkpoint_path, inode)
+            f.seek(offset)
+            data = f.read()
+            
+        # A trailing line without a newline is still being written
+        data = data[:data.rfind(b"\n") + 1]
+        
+        shipped = 0
+        batch = []
+        position = offset
+        for line in data.splitlines(keepends=True):
+            position += len(line)
+            try:
+                batch.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                # Torn write from a crash; nothing to replay
+                print(f"Warning: Skipping corrupt fraud log WAL entry at offset {position - len(line)}")
+                continue
+            
+            if len(batch) >= WRITER_BATCH_SIZE:
+                insert_batch(batch)
+                self._write_checkpoint(checkpoint_path, inode, position)
+                shipped += len(batch)
+                batch = []
+        
+        if batch:
+            insert_batch(batch)
+            shipped += len(batch)
+        if position != offset:
+            self._write_checkpoint(checkpoint_path, inode, position)
+        
+        return shipped, position
+    
+    def start_shipper(self, supabase_client: Client, interval: float = WAL_SHIP_INTERVAL) -> None:
+        """Start shipping the log to Supabase on the running event loop, replaying any backlog first."""
+        if self._shipper is None:
+            self._ship_insert = EmailFraudLogger(supabase_client)._insert_batch
+            self._shipper = asyncio.get_running_loop().create_task(self._ship_loop(interval))
+    
+    async def stop_shipper(self) -> None:
+        """Stop the shipper after a final ship of everything appended so far."""
+        if self._shipper is None:
+            return
+        
+        self._shipper.cancel()
+        try:
+            await self._shipper
+        except asyncio.CancelledError:
+            pass
+        self._shipper = None
+        await self._ship_once()
+    
+    async def _ship_loop(self, interval: float) -> None:
+        while True:
+            await self._ship_once()
+            await asyncio.sleep(interval)
+    
+    async def _ship_once(self) -> None:
+        try:
+            await asyncio.to_thread(self.sync)
+            await asyncio.to_thread(self.ship, self._ship_insert)
+        except Exception as e:
+            # Entries stay in the log and are retried on the next tick
+            print(f"Warning: Failed to ship fraud log WAL: {e}")
+
+
+class WALFraudLogger(EmailFraudLogger):
+    """
+    EmailFraudLogger that appends entries to a FraudLogWAL instead of inserting them.
+    
+    The WAL's shipper writes them to Supabase, so pipeline latency does not depend
+    on Supabase being reachable. Reads still query Supabase and only see shipped
+    entries.
+    """
+    
+    def __init__(self, supabase_client: Client, wal: FraudLogWAL, buffered: bool = False):
+        super().__init__(supabase_client, buffered)
+        self.wal = wal
+    
+    def _insert_batch(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Append log entries to the local WAL and return them."""
+        self.wal.append(entries)
+        return entries
+
+
+_fraud_log_wal: Optional[FraudLogWAL] = None
+
+
+def get_fraud_log_wal() -> Optional[FraudLogWAL]:
+    """Get the process-wide fraud log WAL, or None if FRAUD_LOG_WAL_DIR is not set."""
+    global _fraud_log_wal
+    if _fraud_log_wal is None and FRAUD_LOG_WAL_DIR:
+        _fraud_log_wal = FraudLogWAL(FRAUD_LOG_WAL_DIR)
+    return _fraud_log_wal
+
+
+def create_fraud_logger(supabase_client: Client, buffered: bool = False) -> EmailFraudLogger:
+    """Create a new EmailFraudLogger instance (WAL-backed when FRAUD_LOG_WAL_DIR is set)."""
+    wal = get_fraud_log_wal()
+    if wal is not None:
+        return WALFraudLogger(supabase_client, wal, buffered)
+    return EmailFraudLogger(supabase_client, buffered)
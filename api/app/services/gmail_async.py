@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import weakref
+import httpx
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+GMAIL_API_BASE = "https://gmail.googleapis.com/gmail/v1/users/me"
+
+# Message fetches in flight per call (one user). HTTP/2 multiplexes every
+# request over one connection, so this, not the pool size, bounds concurrency;
+# Gmail rejects bursts beyond its per-user limits with 429
+GMAIL_ASYNC_CONCURRENCY = 10
+
+# Rate-limited (429) and transient 5xx fetches are retried with exponential
+# backoff starting at GMAIL_ASYNC_BACKOFF seconds
+GMAIL_ASYNC_MAX_RETRIES = 3
+GMAIL_ASYNC_BACKOFF = 0.5
+GMAIL_ASYNC_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Long-lived keep-alive client per event loop (an AsyncClient cannot be shared
+# across loops, and background tasks run their own)
+_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+class GmailAuthError(Exception):
+    """Gmail rejected the access token (HTTP 401)."""
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Get the running event loop's Gmail HTTP client, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(base_url=GMAIL_API_BASE, timeout=30, http2=True)
+        _clients[loop] = client
+    return client
+
+
+async def close_client():
+    """Close the running event loop's Gmail HTTP client, if one was created."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def fetch_messages(access_token: str, message_ids: list) -> dict:
+    """
+    Fetch several Gmail messages concurrently over a shared keep-alive HTTP/2 connection.
+
+    At most GMAIL_ASYNC_CONCURRENCY fetches are in flight at once; rate-limited
+    and transient failures are retried with backoff.
+
+    Args:
+        access_token: OAuth access token
+        message_ids: Gmail message IDs to fetch
+
+    Returns:
+        dict mapping message ID to full message resource (fetches that still fail
+        are omitted; callers should retry those another way)
+
+    Raises:
+        GmailAuthError: If the access token is rejected; fall back to the
+            googleapiclient service, which refreshes it
+    """
+    messages = {}
+    params = {'format': 'full'}
+    headers = {'Authorization': f'Bearer {access_token}'}
+    client = _get_client()
+    semaphore = asyncio.Semaphore(GMAIL_ASYNC_CONCURRENCY)
+
+    async def _fetch(message_id: str):
+        for attempt in range(GMAIL_ASYNC_MAX_RETRIES + 1):
+            async with semaphore:
+                response = await client.get(f'/messages/{message_id}', params=params, headers=headers)
+            if response.status_code not in GMAIL_ASYNC_RETRY_STATUSES or attempt == GMAIL_ASYNC_MAX_RETRIES:
+                break
+            await asyncio.sleep(GMAIL_ASYNC_BACKOFF * 2 ** attempt)
+        if response.status_code == 401:
+            raise GmailAuthError(f'Gmail rejected the access token fetching message {message_id}')
+        if response.is_error:
+            raise httpx.HTTPStatusError(
+                f'HTTP {response.status_code}', request=response.request, response=response
+            )
+        messages[message_id] = orjson.loads(response.content)
+
+    results = await asyncio.gather(
+        *(_fetch(message_id) for message_id in message_ids),
+        return_exceptions=True
+    )
+
+    failures = 0
+    for message_id, result in zip(message_ids, results):
+        if isinstance(result, GmailAuthError):
+            raise result
+        if isinstance(result, Exception):
+            failures += 1
+            logger.debug("Error fetching message %s: %s", message_id, result)
+
+    if failures:
+        logger.warning("Failed to fetch %d of %d messages", failures, len(message_ids))
+    return messages
@@ -1,59 +1,341 @@
 import os
-import base64
+import asyncio
+import pybase64
+import hashlib
+import logging
+import multiprocessing
 import re
+import threading
+import time
+import weakref
+import ahocorasick
+import orjson
+import lxml.html
+from lxml import etree
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Callable, Optional
+from html import unescape as unescape_html
 from datetime import datetime, timedelta
 from fastapi import HTTPException
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+from googleapiclient.model import JsonModel
+from app.config import EMAIL_PROCESS_WORKERS
+from .gmail_async import fetch_messages, GmailAuthError
 
+logger = logging.getLogger(__name__)
 
-def extract_email_body(payload):
+
+# Subject terms searched for in Gmail
+INVOICE_TERMS = (
+    'invoice', 'bill', 'receipt', 'payment', 'statement',
+    'charge', 'billing', 'subscription', 'renewal'
+)
+
+# Body phrases Gmail's full-text index can match server-side
+INVOICE_PHRASES = (
+    'amount due', 'invoice number', 'payment method',
+    'bill number', 'account number', 'reference number'
+)
+
+# Gmail search clause for invoice emails; every term is also an invoice
+# indicator, so each listed message is already a match
+INVOICE_QUERY = ' OR '.join(
+    [f'subject:{term}' for term in INVOICE_TERMS] +
+    [f'"{phrase}"' for phrase in INVOICE_PHRASES]
+)
+
+# Body/subject phrases that mark an email as invoice-related
+INVOICE_INDICATORS = INVOICE_TERMS + INVOICE_PHRASES + ('total', 'subtotal', 'tax')
+
+
+def _build_automaton(words) -> ahocorasick.Automaton:
+    """Build an Aho-Corasick automaton that reports each word it finds."""
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+
+_INVOICE_AUTOMATON = _build_automaton(INVOICE_INDICATORS)
+
+# Headers read from messages
+EMAIL_METADATA_HEADERS = ('From', 'Subject', 'Date')
+
+# Email bodies stop collecting MIME parts past this many characters
+EMAIL_BODY_MAX_CHARS = 1_000_000
+
+# Characters of an email body scanned for indicators (they almost always appear early)
+INDICATOR_SCAN_LIMIT = 64 * 1024
+
+
+def find_invoice_indicators(*texts: str) -> list:
     """
-    Extract text content from email payload.
+    Find every invoice indicator contained in lowercase texts, one pass per text.
+    
+    Returns:
+        list of matched indicators, in INVOICE_INDICATORS order
     """
-    body = ""
+    found = {word for text in texts for _, word in _INVOICE_AUTOMATON.iter(text)}
+    return [indicator for indicator in INVOICE_INDICATORS if indicator in found]
+
+
+# Refreshed access tokens (token, expiry) per (client ID, refresh token), reused
+# instead of hitting the token endpoint again while they have more than
+# CREDS_MIN_LIFETIME left. Only token data is shared: each request gets its own
+# Credentials and service, since google-auth refreshes credentials in place and
+# the services' httplib2 connections are not thread-safe
+CREDS_CACHE_SIZE = 1024
+CREDS_MIN_LIFETIME = timedelta(seconds=60)
+_refreshed_token_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+# Gmail label IDs per (account, label name), so labeling a message does not
+# list the user's labels every time
+LABEL_CACHE_SIZE = 4096
+LABEL_CACHE_TTL = 3600  # seconds
+_label_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+# Sender profile picture URLs ('' when the contact has none) per
+# (account, sender email); senders repeat across syncs
+PROFILE_PICTURE_CACHE_SIZE = 10_000
+PROFILE_PICTURE_CACHE_TTL = 86400  # seconds
+_profile_picture_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+# Account each service was created for (keys the label cache), so labeling
+# does not look up the account's email address per request
+_service_accounts: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+# Guards the caches; services are created from request handlers and worker threads
+_gmail_cache_lock = threading.Lock()
+
+
+# Sub-requests per Gmail batch call (Gmail accepts 100 but rate-limits batches above 50)
+GMAIL_BATCH_SIZE = 50
+
+
+# Discovery documents shipped with googleapiclient, read from disk and parsed
+# once; building a service from the parsed document is cheap enough to do per request
+GMAIL_DISCOVERY_DOC = orjson.loads(get_static_doc('gmail', 'v1'))
+PEOPLE_DISCOVERY_DOC = orjson.loads(get_static_doc('people', 'v1'))
+
+
+class OrjsonModel(JsonModel):
+    """googleapiclient JSON model that parses responses (full messages, batch parts) with orjson."""
     
-    def extract_text_from_part(part):
-        """Recursively extract text from email parts."""
-        if 'parts' in part:
-            # Multipart message
-            text_content = ""
-            for subpart in part['parts']:
-                text_content += extract_text_from_part(subpart)
-            return text_content
-        else:
-            # Single part
-            if part.get('mimeType') == 'text/plain':
-                data = part.get('body', {}).get('data', '')
-                if data:
-                    # Decode base64 content
-                    try:
-                        decoded = base64.urlsafe_b64decode(data).decode('utf-8')
-                        return decoded
-                    except:
-                        return ""
-            elif part.get('mimeType') == 'text/html':
-                # For HTML, we could parse it, but for now just get raw content
-                data = part.get('body', {}).get('data', '')
-                if data:
-                    try:
-                        decoded = base64.urlsafe_b64decode(data).decode('utf-8')
-                        # Simple HTML tag removal (basic)
-                        clean_text = re.sub('<.*?>', ' ', decoded)
-                        return clean_text
-                    except:
-                        return ""
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return content.decode('utf-8') if isinstance(content, bytes) else content
+        if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+            body = body['data']
+        return body
+
+
+class _ThreadLocalHttp:
+    """
+    httplib2.Http stand-in that sends each request on the calling thread's own Http.
+    
+    httplib2 keeps connections open per host, but an Http must not be used from
+    two threads at once. Services are built per request and may run their calls
+    in worker threads, so the Http is picked when a request is sent rather than
+    when the service is built; every service used on a thread then shares its
+    keep-alive connections (credentials are per-request headers).
+    """
+    
+    def __init__(self):
+        self._local = threading.local()
+    
+    def _http(self):
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = build_http()
+        return http
+    
+    def request(self, *args, **kwargs):
+        return self._http().request(*args, **kwargs)
+    
+    def close(self):
+        self._http().close()
+    
+    def __getattr__(self, name):
+        return getattr(self._http(), name)
+
+
+_google_http = _ThreadLocalHttp()
+
+
+def _build_api(api: str, discovery_doc: dict, creds):
+    """Build a Google API service from its packaged discovery document, on the shared connections."""
+    http = AuthorizedHttp(creds, http=_google_http)
+    if discovery_doc:
+        return build_from_document(discovery_doc, http=http, model=OrjsonModel())
+    return build(api, 'v1', http=http, cache_discovery=False, model=OrjsonModel())
+
+
+def _get_people_service(creds):
+    """Build a People API service for credentials (one per call; services are not thread-safe)."""
+    return _build_api('people', PEOPLE_DISCOVERY_DOC, creds)
+
+
+def _token_cache_key(access_token: str, refresh_token: str = None) -> str:
+    """Hash the OAuth tokens so raw tokens are not used as cache keys."""
+    return hashlib.blake2b(
+        f"{access_token}:{refresh_token or ''}".encode(), digest_size=16
+    ).hexdigest()
+
+
+def _refresh_cache_key(refresh_token: str) -> str:
+    """Key refreshed credentials by OAuth client and refresh token."""
+    return hashlib.sha256(f"{os.getenv('GOOGLE_CLIENT_ID')}:{refresh_token}".encode()).hexdigest()
+
+
+def _account_cache_key(access_token: str, refresh_token: str = None) -> str:
+    """Key per-account caches by refresh token when there is one, else by access token."""
+    return _refresh_cache_key(refresh_token) if refresh_token else _token_cache_key(access_token)
+
+
+def _expiry_fresh(expiry) -> bool:
+    """Whether a token expiry is known and more than CREDS_MIN_LIFETIME away."""
+    # google-auth keeps expiry as naive UTC
+    return expiry is not None and expiry - datetime.utcnow() > CREDS_MIN_LIFETIME
+
+
+def _ttl_cache_put(cache: OrderedDict, max_size: int, key, value):
+    """Insert a timestamped value into an LRU cache, evicting the oldest entry when full."""
+    with _gmail_cache_lock:
+        cache[key] = (value, time.monotonic())
+        cache.move_to_end(key)
+        if len(cache) > max_size:
+            cache.popitem(last=False)
+
+
+def _ttl_cache_get(cache: OrderedDict, ttl: float, key):
+    """Return a cached value stored less than ttl seconds ago, else None."""
+    with _gmail_cache_lock:
+        cached = cache.get(key)
+    if cached and time.monotonic() - cached[1] < ttl:
+        return cached[0]
+    return None
+
+
+# HTML parts are parsed straight from the decoded base64 bytes
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+# Tag stripper for small HTML parts and HTML the parser rejects
+_HTML_TAG_RE = re.compile(rb'<[^>]*>')
+
+# Below this size stripping tags is several times faster than building a tree
+HTML_PARSER_MIN_SIZE = 16 * 1024
+
+
+def _strip_html_tags(html: bytes) -> str:
+    return unescape_html(_HTML_TAG_RE.sub(b' ', html).decode('utf-8', 'replace'))
+
+
+def html_to_text(html: bytes) -> str:
+    """Extract the text of a UTF-8 HTML document, using lxml's C parser for large ones."""
+    if len(html) < HTML_PARSER_MIN_SIZE:
+        return _strip_html_tags(html)
+    try:
+        return ' '.join(lxml.html.fromstring(html, parser=_HTML_PARSER).itertext())
+    except (etree.ParserError, ValueError):
+        # Unparseable document
+        return _strip_html_tags(html)
+
+
+def batch_get_messages(service, message_ids: list) -> dict:
+    """
+    Fetch several Gmail messages with batch requests instead of one HTTP call each.
+    
+    Args:
+        service: Gmail API service
+        message_ids: Gmail message IDs to fetch
+        
+    Returns:
+        dict mapping message ID to full message resource (failed fetches are omitted)
+    """
+    messages = {}
+    failures = []
+    
+    def _on_message(request_id, response, exception):
+        if exception is not None:
+            failures.append(request_id)
+            logger.debug("Error fetching message %s: %s", request_id, exception)
+            return
+        messages[request_id] = response
+    
+    for start in range(0, len(message_ids), GMAIL_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=_on_message)
+        for message_id in message_ids[start:start + GMAIL_BATCH_SIZE]:
+            batch.add(
+                service.users().messages().get(userId='me', id=message_id, format='full'),
+                request_id=message_id
+            )
+        batch.execute()
+    
+    if failures:
+        logger.warning("Failed to fetch %d of %d messages", len(failures), len(message_ids))
+    return messages
+
+
+def _extract_text_from_part(part) -> str:
+    """Extract text from a single (non-multipart) email part."""
+    mime_type = part.get('mimeType')
+    if mime_type != 'text/plain' and mime_type != 'text/html':
+        return ""
+    data = part.get('body', {}).get('data', '')
+    if not data:
         return ""
+    # Gmail omits base64 padding; pybase64 accepts it unpadded. Only malformed
+    # data (binascii.Error) or non-UTF-8 text (UnicodeDecodeError), both
+    # ValueErrors, make a part unreadable.
+    try:
+        if mime_type == 'text/plain':
+            return pybase64.urlsafe_b64decode(data).decode('utf-8')
+        # Keep bytes: lxml decodes while parsing, no separate str copy
+        return html_to_text(pybase64.urlsafe_b64decode(data))
+    except ValueError as e:
+        logger.debug("Skipping undecodable %s part: %s", mime_type, e)
+        return ""
+
+
+def extract_email_body(payload):
+    """
+    Extract text content from email payload.
+    
+    Walks the MIME tree depth-first without recursion and stops once
+    EMAIL_BODY_MAX_CHARS of text have been collected.
+    """
+    chunks = []
+    length = 0
     
     try:
-        body = extract_text_from_part(payload)
+        stack = [payload]
+        while stack and length < EMAIL_BODY_MAX_CHARS:
+            part = stack.pop()
+            if 'parts' in part:
+                # Multipart message: visit subparts in order
+                stack.extend(reversed(part['parts']))
+                continue
+            
+            text = _extract_text_from_part(part)
+            if text:
+                chunks.append(text)
+                length += len(text)
     except Exception as e:
-        print(f"Error extracting email body: {e}")
-        body = ""
+        logger.error("Error extracting email body: %s", e)
+        return ""
     
-    return body
+    return ''.join(chunks)
 
 
 def create_gmail_service(access_token: str, refresh_token: str = None, attempt_refresh: bool = False):
@@ -70,11 +352,21 @@ def create_gmail_service(access_token: str, refresh_token: str = None, attempt_r
         # Create credentials object
         effective_refresh_token = refresh_token if (refresh_token and refresh_token.strip()) else None
         
-        if not effective_refresh_token:
-            print("⚠️  No refresh token - token cannot be refreshed")
+        # A token we refreshed recently is still good: skip the token endpoint,
+        # unless it is the very token that just failed
+        expiry = None
+        if effective_refresh_token:
+            with _gmail_cache_lock:
+                cached = _refreshed_token_cache.get(_refresh_cache_key(effective_refresh_token))
+            if cached and _expiry_fresh(cached[1]) and not (attempt_refresh and cached[0] == access_token):
+                access_token, expiry = cached
+                attempt_refresh = False
+        else:
+            logger.warning("No refresh token - token cannot be refreshed")
         
         creds = Credentials(
             token=access_token,
+            expiry=expiry,
             refresh_token=effective_refresh_token,
             token_uri="https://oauth2.googleapis.com/token",
             client_id=os.getenv("GOOGLE_CLIENT_ID"),
@@ -87,12 +379,21 @@ def create_gmail_service(access_token: str, refresh_token: str = None, attempt_r
         
         # Only refresh if explicitly requested (after API failure)
         if attempt_refresh and creds.refresh_token:
-            print("🔄 Attempting to refresh access token...")
+            logger.info("Attempting to refresh access token")
             creds.refresh(Request())
-            print("✅ Token refreshed successfully")
+            logger.info("Token refreshed successfully")
         
         # Build Gmail service
-        service = build('gmail', 'v1', credentials=creds)
+        service = _build_api('gmail', GMAIL_DISCOVERY_DOC, creds)
+        
+        with _gmail_cache_lock:
+            _service_accounts[service] = _account_cache_key(creds.token, effective_refresh_token)
+            if effective_refresh_token and _expiry_fresh(creds.expiry):
+                cache_key = _refresh_cache_key(effective_refresh_token)
+                _refreshed_token_cache[cache_key] = (creds.token, creds.expiry)
+                _refreshed_token_cache.move_to_end(cache_key)
+                if len(_refreshed_token_cache) > CREDS_CACHE_SIZE:
+                    _refreshed_token_cache.popitem(last=False)
         
         # Return both service and credentials
         return service, creds
@@ -104,45 +405,106 @@ def create_gmail_service(access_token: str, refresh_token: str = None, attempt_r
         )
 
 
-def get_email_attachments(service, message_id: str, user_id: str = 'me'):
+def get_email_attachments(service, message_id: str, user_id: str = 'me',
+                          sink_factory: Callable[[str], BinaryIO] = None):
     """
     Download attachments from a Gmail message.
+    Attachment bodies are fetched together in batch requests.
+    
+    With sink_factory, each attachment is instead fetched on its own, decoded
+    and written to the file object sink_factory(filename) returns, so only one
+    attachment is held in memory at a time. Those entries carry the file's
+    'path' instead of base64 'data'.
     """
     try:
         message = service.users().messages().get(userId=user_id, id=message_id).execute()
-        attachments = []
         
-        if 'payload' in message:
-            parts = message['payload'].get('parts', [])
-            
+        parts = [
+            part for part in message.get('payload', {}).get('parts', [])
+            if part.get('filename') and part.get('body', {}).get('attachmentId')
+        ]
+        if not parts:
+            return []
+        
+        if sink_factory is not None:
+            saved = []
             for part in parts:
-                if part.get('filename') and part.get('body', {}).get('attachmentId'):
-                    attachment_id = part['body']['attachmentId']
-                    filename = part['filename']
-                    mime_type = part.get('mimeType', '')
-                    
-                    # Download attachment
-                    att = service.users().messages().attachments().get(
+                # Skip an attachment that fails, as the batch path does, rather than losing them all
+                try:
+                    saved.append(_save_attachment(service, user_id, message_id, part, sink_factory))
+                except Exception as e:
+                    logger.warning(
+                        "Error saving attachment %s of message %s: %s",
+                        part['filename'], message_id, e
+                    )
+            return saved
+        
+        downloaded = {}
+        
+        def _on_attachment(request_id, response, exception):
+            if exception is not None:
+                logger.warning(
+                    "Error downloading attachment %s of message %s: %s",
+                    request_id, message_id, exception
+                )
+                return
+            downloaded[request_id] = response
+        
+        # Download attachments
+        for start in range(0, len(parts), GMAIL_BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=_on_attachment)
+            for index, part in enumerate(parts[start:start + GMAIL_BATCH_SIZE], start):
+                batch.add(
+                    service.users().messages().attachments().get(
                         userId=user_id, 
                         messageId=message_id, 
-                        id=attachment_id
-                    ).execute()
-                    
-                    data = att.get('data', '')
-                    
-                    attachments.append({
-                        'filename': filename,
-                        'mime_type': mime_type,
-                        'data': data,
-                        'size': att.get('size', 0)
-                    })
+                        id=part['body']['attachmentId']
+                    ),
+                    request_id=str(index)
+                )
+            batch.execute()
+        
+        attachments = []
+        for index, part in enumerate(parts):
+            att = downloaded.get(str(index))
+            if att is None:
+                continue
+            
+            attachments.append({
+                'filename': part['filename'],
+                'mime_type': part.get('mimeType', ''),
+                'data': att.get('data', ''),
+                'size': att.get('size', 0)
+            })
         
         return attachments
     except Exception as e:
-        print(f"Error getting attachments for message {message_id}: {e}")
+        logger.error("Error getting attachments for message %s: %s", message_id, e)
         return []
 
 
+def _save_attachment(service, user_id: str, message_id: str, part: dict,
+                     sink_factory: Callable[[str], BinaryIO]) -> dict:
+    """Download one attachment, decode it into a sink and describe the saved file."""
+    att = service.users().messages().attachments().get(
+        userId=user_id, 
+        messageId=message_id, 
+        id=part['body']['attachmentId']
+    ).execute()
+    
+    data = pybase64.urlsafe_b64decode(att.get('data', ''))
+    with sink_factory(part['filename']) as fh:
+        fh.write(data)
+        path = fh.name
+    
+    return {
+        'filename': part['filename'],
+        'mime_type': part.get('mimeType', ''),
+        'path': path,
+        'size': len(data)
+    }
+
+
 def get_user_email_address(service):
     """
     Get the authenticated user's email address.
@@ -151,13 +513,43 @@ def get_user_email_address(service):
         profile = service.users().getProfile(userId='me').execute()
         return profile.get('emailAddress', '')
     except Exception as e:
-        print(f"Error getting user email address: {e}")
+        logger.error("Error getting user email address: %s", e)
         return ''
 
 
+def _label_cache_owner(service) -> str:
+    """Account the service's labels are cached under ('' if unknown)."""
+    with _gmail_cache_lock:
+        owner = _service_accounts.get(service)
+    if owner is None:
+        # Service not built by create_gmail_service: key by its email address
+        owner = get_user_email_address(service)
+        if owner:
+            with _gmail_cache_lock:
+                _service_accounts[service] = owner
+    return owner
+
+
+def _cache_label(owner: str, label_name: str, label_id: str):
+    _ttl_cache_put(_label_cache, LABEL_CACHE_SIZE, (owner, label_name), label_id)
+
+
+def _cached_label_id(owner: str, label_name: str):
+    return _ttl_cache_get(_label_cache, LABEL_CACHE_TTL, (owner, label_name))
+
+
+def _evict_label(service, label_name: str):
+    """Forget a cached label ID (e.g. the label was deleted in Gmail)."""
+    with _gmail_cache_lock:
+        owner = _service_accounts.get(service)
+        if owner:
+            _label_cache.pop((owner, label_name), None)
+
+
 def get_or_create_gmail_label(service, label_name: str):
     """
     Get or create a custom Gmail label.
+    Label IDs are cached per account for LABEL_CACHE_TTL seconds.
     
     Args:
         service: Gmail API service
@@ -167,14 +559,25 @@ def get_or_create_gmail_label(service, label_name: str):
         str: Label ID
     """
     try:
+        owner = _label_cache_owner(service)
+        if owner:
+            label_id = _cached_label_id(owner, label_name)
+            if label_id:
+                return label_id
+        
         # List existing labels
         results = service.users().labels().list(userId='me').execute()
         labels = results.get('labels', [])
         
-        # Check if label already exists
+        # Check if label already exists (caching every label seen on the way)
+        label_id = None
         for label in labels:
+            if owner:
+                _cache_label(owner, label['name'], label['id'])
             if label['name'] == label_name:
-                return label['id']
+                label_id = label['id']
+        if label_id:
+            return label_id
         
         # Determine color based on label name
         # Gmail only allows specific color codes from their palette
@@ -210,14 +613,40 @@ def get_or_create_gmail_label(service, label_name: str):
             body=label_object
         ).execute()
         
-        print(f"   ✅ Created Gmail label: {label_name}")
+        logger.info("Created Gmail label: %s", label_name)
+        if owner:
+            _cache_label(owner, label_name, created_label['id'])
         return created_label['id']
         
     except Exception as e:
-        print(f"Error getting/creating label: {e}")
+        logger.error("Error getting/creating label: %s", e)
         return None
 
 
+# Map our labels to Gmail label names
+GMAIL_LABEL_NAMES = {
+    'safe': 'Donna/Safe',
+    'unsure': 'Donna/Unsure',
+    'fraudulent': 'Donna/Fraudulent'
+}
+
+# Gmail's limit on message IDs per messages.batchModify request
+GMAIL_BATCH_MODIFY_SIZE = 1000
+
+
+def _gmail_label_name(label_name: str) -> str:
+    return GMAIL_LABEL_NAMES.get(label_name, f'Donna/{label_name.title()}')
+
+
+def _batch_modify(service, message_ids: list, body: dict):
+    """Apply one label change to many messages, GMAIL_BATCH_MODIFY_SIZE IDs per request."""
+    for start in range(0, len(message_ids), GMAIL_BATCH_MODIFY_SIZE):
+        service.users().messages().batchModify(
+            userId='me',
+            body={'ids': message_ids[start:start + GMAIL_BATCH_MODIFY_SIZE], **body}
+        ).execute()
+
+
 def apply_gmail_label(service, message_id: str, label_name: str):
     """
     Apply a custom label to a Gmail message.
@@ -231,14 +660,7 @@ def apply_gmail_label(service, message_id: str, label_name: str):
         dict with success status
     """
     try:
-        # Map our labels to Gmail label names
-        label_mapping = {
-            'safe': 'Donna/Safe',
-            'unsure': 'Donna/Unsure',
-            'fraudulent': 'Donna/Fraudulent'
-        }
-        
-        gmail_label_name = label_mapping.get(label_name, f'Donna/{label_name.title()}')
+        gmail_label_name = _gmail_label_name(label_name)
         
         # Get or create the label
         label_id = get_or_create_gmail_label(service, gmail_label_name)
@@ -250,11 +672,17 @@ def apply_gmail_label(service, message_id: str, label_name: str):
             }
         
         # Apply label to message
-        service.users().messages().modify(
-            userId='me',
-            id=message_id,
-            body={'addLabelIds': [label_id]}
-        ).execute()
+        try:
+            service.users().messages().modify(
+                userId='me',
+                id=message_id,
+                body={'addLabelIds': [label_id]}
+            ).execute()
+        except HttpError as error:
+            if error.resp.status in (400, 404):
+                # The cached label may have been deleted; look it up again next time
+                _evict_label(service, gmail_label_name)
+            raise
         
         return {
             'success': True,
@@ -263,7 +691,7 @@ def apply_gmail_label(service, message_id: str, label_name: str):
         }
         
     except Exception as e:
-        print(f"Error applying Gmail label: {e}")
+        logger.error("Error applying Gmail label: %s", e)
         return {
             'success': False,
             'message': str(e)
@@ -297,7 +725,37 @@ def move_email_to_spam(service, message_id: str):
             'message': f'Email {message_id} moved to spam'
         }
     except Exception as e:
-        print(f"Error moving email to spam: {e}")
+        logger.error("Error moving email to spam: %s", e)
+        return {
+            'success': False,
+            'message': str(e)
+        }
+
+
+def move_emails_to_spam_bulk(service, message_ids: list):
+    """
+    Move many emails to spam/junk folder using messages.batchModify.
+    
+    Args:
+        service: Gmail API service
+        message_ids: Gmail message IDs
+        
+    Returns:
+        dict with success status
+    """
+    try:
+        # Add SPAM label and remove INBOX label
+        _batch_modify(service, list(message_ids), {
+            'addLabelIds': ['SPAM'],
+            'removeLabelIds': ['INBOX']
+        })
+        
+        return {
+            'success': True,
+            'message': f'{len(message_ids)} emails moved to spam'
+        }
+    except Exception as e:
+        logger.error("Error moving emails to spam: %s", e)
         return {
             'success': False,
             'message': str(e)
@@ -316,8 +774,7 @@ def get_sender_profile_picture(email_address: str, creds) -> str:
         Profile picture URL or empty string if not found
     """
     try:
-        # Build People API service
-        people_service = build('people', 'v1', credentials=creds)
+        people_service = _get_people_service(creds)
         
         # Search for person by email
         results = people_service.people().searchContacts(
@@ -356,13 +813,14 @@ def get_sender_profile_picture(email_address: str, creds) -> str:
         return ''
         
     except Exception as e:
-        print(f"Error fetching profile picture for {email_address}: {e}")
+        logger.error("Error fetching profile picture for %s: %s", email_address, e)
         return ''
 
 
 def batch_get_profile_pictures(email_addresses: list, creds) -> dict:
     """
     Batch fetch profile pictures for multiple email addresses.
+    Lookups (including misses) are cached per account for PROFILE_PICTURE_CACHE_TTL seconds.
     
     Args:
         email_addresses: List of email addresses
@@ -372,48 +830,75 @@ def batch_get_profile_pictures(email_addresses: list, creds) -> dict:
         Dictionary mapping email addresses to profile picture URLs
     """
     profile_pics = {}
+    account = _account_cache_key(creds.token, creds.refresh_token)
+    emails = []
+    for email in dict.fromkeys(email_addresses):
+        if not email:
+            continue
+        url = _ttl_cache_get(_profile_picture_cache, PROFILE_PICTURE_CACHE_TTL, (account, email))
+        if url is None:
+            emails.append(email)
+        elif url:
+            profile_pics[email] = url
+    if not emails:
+        return profile_pics
+    
+    def _on_contacts(request_id, response, exception):
+        # Silently skip errors for individual lookups (not cached)
+        if exception is not None:
+            return
+        
+        email = emails[int(request_id)]
+        url = ''
+        contacts = response.get('results', [])
+        if contacts:
+            person = contacts[0].get('person', {})
+            photos = person.get('photos', [])
+            if photos and photos[0].get('url'):
+                url = photos[0]['url']
+                profile_pics[email] = url
+                logger.debug("Found profile picture for %s", email)
+        _ttl_cache_put(_profile_picture_cache, PROFILE_PICTURE_CACHE_SIZE, (account, email), url)
     
     try:
-        # Build People API service
-        people_service = build('people', 'v1', credentials=creds)
+        people_service = _get_people_service(creds)
         
-        # Batch lookup (People API supports batch operations)
-        for email in email_addresses:
-            if not email:
-                continue
-            
-            try:
-                # Search for this contact
-                results = people_service.people().searchContacts(
-                    query=email,
-                    readMask='photos'
-                ).execute()
-                
-                contacts = results.get('results', [])
-                if contacts:
-                    person = contacts[0].get('person', {})
-                    photos = person.get('photos', [])
-                    if photos and photos[0].get('url'):
-                        profile_pics[email] = photos[0]['url']
-                        print(f"   🖼️  Found profile picture for {email}")
-            except Exception as e:
-                # Silently skip errors for individual lookups
-                continue
+        # Search for the contacts in batch requests
+        for start in range(0, len(emails), GMAIL_BATCH_SIZE):
+            batch = people_service.new_batch_http_request(callback=_on_contacts)
+            for index in range(start, min(start + GMAIL_BATCH_SIZE, len(emails))):
+                batch.add(
+                    people_service.people().searchContacts(
+                        query=emails[index],
+                        readMask='photos'
+                    ),
+                    request_id=str(index)
+                )
+            batch.execute()
         
     except Exception as e:
-        print(f"Error in batch profile picture lookup: {e}")
+        logger.error("Error in batch profile picture lookup: %s", e)
     
     return profile_pics
 
 
-async def get_user_emails(service, days_back: int = 90, include_attachments: bool = False):
+async def iter_user_emails(service, days_back: int = 90, include_attachments: bool = False,
+                           max_results: int = 100, creds=None, include_full_body: bool = False):
     """
-    Fetch user's invoice-related emails from the past specified days.
+    Stream user's invoice-related emails from the past specified days.
+    
+    Yields each email as soon as its page has been fetched, so callers can
+    start processing before the remaining pages arrive.
     
     Args:
         service: Gmail API service
         days_back: Number of days to look back
         include_attachments: Whether to download and include attachments
+        max_results: Maximum number of emails to yield
+        creds: Service credentials; when given, message details are fetched
+            concurrently over async HTTP instead of Gmail batch requests
+        include_full_body: Whether to include the full body text ('full_body'),
+            e.g. for biller extraction
     """
     try:
         # Calculate date for query (3 months ago)
@@ -421,103 +906,196 @@ async def get_user_emails(service, days_back: int = 90, include_attachments: boo
         date_query = date_from.strftime('%Y/%m/%d')
         
         # Search for invoice-related emails from the past 3 months
-        # Using OR operator to search for various invoice-related terms
-        invoice_terms = [
-            'invoice',
-            'bill',
-            'receipt',
-            'payment',
-            'statement',
-            'charge',
-            'billing',
-            'subscription',
-            'renewal'
-        ]
+        query = f'after:{date_query} AND ({INVOICE_QUERY})'
         
-        # Create query with invoice terms
-        invoice_query = ' OR '.join([f'subject:{term}' for term in invoice_terms])
-        query = f'after:{date_query} AND ({invoice_query})'
-        
-        # Get list of message IDs
-        results = service.users().messages().list(
-            userId='me', 
-            q=query,
-            maxResults=100  # Limit to prevent overwhelming response
-        ).execute()
-        
-        messages = results.get('messages', [])
-        
-        if not messages:
-            return []
-        
-        # Fetch details for each message
-        emails = []
-        for message in messages:
-            try:
-                msg = service.users().messages().get(
-                    userId='me', 
-                    id=message['id'],
-                    format='full'
-                ).execute()
-                
-                # Extract headers
-                headers = {header['name']: header['value'] for header in msg['payload'].get('headers', [])}
-                
-                # Extract email body
-                body_text = extract_email_body(msg['payload'])
-                
-                # Additional invoice detection in body content
-                invoice_indicators = [
-                    'invoice', 'bill', 'receipt', 'payment', 'statement', 
-                    'charge', 'billing', 'subscription', 'renewal', 'amount due',
-                    'total', 'subtotal', 'tax', 'payment method', 'account number',
-                    'invoice number', 'bill number', 'reference number'
-                ]
-                
-                # Check if email contains invoice-related content
-                subject_lower = headers.get('Subject', '').lower()
-                body_lower = body_text.lower()
-                snippet_lower = msg.get('snippet', '').lower()
-                
-                # Combine all text for better detection
-                all_text = f"{subject_lower} {body_lower} {snippet_lower}"
-                
-                # Check if any invoice indicators are present
-                has_invoice_content = any(indicator in all_text for indicator in invoice_indicators)
-                
-                if has_invoice_content:
-                    email_data = {
-                        'id': message['id'],
-                        'thread_id': msg.get('threadId'),
-                        'from': headers.get('From', ''),
-                        'subject': headers.get('Subject', ''),
-                        'date': headers.get('Date', ''),
-                        'snippet': msg.get('snippet', ''),
-                        'body_preview': body_text[:500] + '...' if len(body_text) > 500 else body_text,
-                        'full_body': body_text,  # Include full body for biller extraction
-                        'invoice_indicators': [indicator for indicator in invoice_indicators if indicator in all_text]
-                    }
-                    
-                    # Download attachments if requested
-                    if include_attachments:
-                        try:
-                            attachments = get_email_attachments(service, message['id'])
-                            if attachments:
-                                email_data['attachments'] = attachments
-                        except Exception as att_error:
-                            print(f"Failed to get attachments for {message['id']}: {att_error}")
-                            email_data['attachments'] = []
-                    
-                    emails.append(email_data)
+        remaining = max_results
+        page_token = None
+        while remaining > 0:
+            # Get the next page of message IDs
+            results = await asyncio.to_thread(
+                service.users().messages().list(
+                    userId='me',
+                    q=query,
+                    maxResults=min(remaining, 100),
+                    pageToken=page_token
+                ).execute
+            )
+            
+            messages = results.get('messages', [])
+            if not messages:
+                return
+            
+            # Every listed message matched an invoice term (subject or body
+            # phrase), so fetch them all; a snippet need not show a body phrase
+            fetched = await _fetch_messages(service, creds, [message['id'] for message in messages])
+            
+            # Decode and scan bodies (CPU-bound) across the process pool
+            emails = await _build_emails_data_async([
+                (message['id'], fetched[message['id']])
+                for message in messages if message['id'] in fetched
+            ], include_full_body)
+            # Only emails actually returned count towards max_results
+            remaining -= len(emails)
+            
+            for email_data in emails:
+                # Download attachments if requested
+                if include_attachments:
+                    try:
+                        attachments = await asyncio.to_thread(
+                            get_email_attachments, service, email_data['id']
+                        )
+                        if attachments:
+                            email_data['attachments'] = attachments
+                    except Exception as att_error:
+                        logger.warning("Failed to get attachments for %s: %s", email_data['id'], att_error)
+                        email_data['attachments'] = []
                 
-            except HttpError as error:
-                print(f'An error occurred fetching message {message["id"]}: {error}')
-                continue
-        
-        return emails
+                yield email_data
+            
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                return
         
     except HttpError as error:
         raise HTTPException(
             status_code=500,
             detail=f'Gmail API error: {error}'
         )
+
+
+async def _fetch_messages(service, creds, message_ids: list) -> dict:
+    """
+    Fetch messages concurrently over async HTTP when creds allow, else in batch requests.
+    Messages the async fetch could not get are retried in batch requests.
+    """
+    fetched = {}
+    if creds is not None and creds.token and not creds.expired:
+        try:
+            fetched = await fetch_messages(creds.token, message_ids)
+        except GmailAuthError:
+            # The service's transport refreshes the token
+            logger.info("Access token rejected, fetching through the Gmail service")
+    missing = [message_id for message_id in message_ids if message_id not in fetched]
+    if missing:
+        fetched.update(await asyncio.to_thread(batch_get_messages, service, missing))
+    return fetched
+
+
+def _select_headers(headers: list) -> dict:
+    """Pick the EMAIL_METADATA_HEADERS values from a Gmail header list in one pass."""
+    selected = {}
+    for header in headers:
+        name = header['name']
+        if name in EMAIL_METADATA_HEADERS and name not in selected:
+            selected[name] = header['value']
+            if len(selected) == len(EMAIL_METADATA_HEADERS):
+                break
+    return selected
+
+
+def _build_email_data(message_id: str, msg: dict, include_full_body: bool = False) -> dict:
+    """Build the email summary returned for a fetched Gmail message."""
+    # Extract headers
+    headers = _select_headers(msg['payload'].get('headers', ()))
+    
+    # Extract email body
+    body_text = extract_email_body(msg['payload'])
+    
+    # Gmail already matched the query; collect the indicators for the response.
+    # Only the head of the body is lowercased and scanned unless it has no hits.
+    # Fields are joined with newlines (which no indicator contains) and
+    # lowercased in one pass.
+    invoice_indicators = find_invoice_indicators('\n'.join((
+        headers.get('Subject', ''),
+        body_text[:INDICATOR_SCAN_LIMIT],
+        msg.get('snippet', '')
+    )).lower())
+    if not invoice_indicators and len(body_text) > INDICATOR_SCAN_LIMIT:
+        invoice_indicators = find_invoice_indicators(body_text.lower())
+    
+    email_data = {
+        'id': message_id,
+        'thread_id': msg.get('threadId'),
+        'from': headers.get('From', ''),
+        'subject': headers.get('Subject', ''),
+        'date': headers.get('Date', ''),
+        'snippet': msg.get('snippet', ''),
+        'body_preview': body_text[:500] + '...' if len(body_text) > 500 else body_text,
+        'invoice_indicators': invoice_indicators
+    }
+    if include_full_body:
+        email_data['full_body'] = body_text  # Full body for biller extraction
+    return email_data
+
+
+# Messages per process pool task when building email summaries
+EMAIL_PROCESS_CHUNK_SIZE = 8
+
+_email_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_email_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Get the process pool for email body processing, or None if EMAIL_PROCESS_WORKERS is 0."""
+    global _email_process_pool
+    if _email_process_pool is None and EMAIL_PROCESS_WORKERS > 0:
+        # Spawn rather than fork: the server process runs threads and open connections
+        _email_process_pool = ProcessPoolExecutor(
+            max_workers=EMAIL_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    return _email_process_pool
+
+
+def shutdown_email_process_pool():
+    """Stop the email processing pool's worker processes."""
+    global _email_process_pool
+    if _email_process_pool is not None:
+        _email_process_pool.shutdown(cancel_futures=True)
+        _email_process_pool = None
+
+
+def _build_emails_data(messages: list, include_full_body: bool = False) -> list:
+    """Build email summaries for (message ID, message) pairs; runs in pool workers."""
+    return [_build_email_data(message_id, msg, include_full_body) for message_id, msg in messages]
+
+
+async def _build_emails_data_async(messages: list, include_full_body: bool = False) -> list:
+    """Build email summaries in parallel on the process pool, keeping message order."""
+    pool = get_email_process_pool()
+    if pool is None or len(messages) <= 1:
+        return _build_emails_data(messages, include_full_body)
+    
+    loop = asyncio.get_running_loop()
+    try:
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(
+                pool, _build_emails_data,
+                messages[start:start + EMAIL_PROCESS_CHUNK_SIZE], include_full_body
+            )
+            for start in range(0, len(messages), EMAIL_PROCESS_CHUNK_SIZE)
+        ))
+    except BrokenProcessPool as error:
+        logger.error("Email process pool failed, processing in-process: %s", error)
+        shutdown_email_process_pool()
+        return _build_emails_data(messages, include_full_body)
+    return [email for chunk in chunks for email in chunk]
+
+
+async def get_user_emails(service, days_back: int = 90, include_attachments: bool = False, creds=None,
+                          include_full_body: bool = False):
+    """
+    Fetch user's invoice-related emails from the past specified days.
+    
+    Args:
+        service: Gmail API service
+        days_back: Number of days to look back
+        include_attachments: Whether to download and include attachments
+        creds: Service credentials, enables concurrent async message fetches
+        include_full_body: Whether to include the full body text ('full_body')
+    """
+    return [
+        email async for email in iter_user_emails(
+            service, days_back, include_attachments, creds=creds,
+            include_full_body=include_full_body
+        )
+    ]
@@ -1,9 +1,14 @@
 import os
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from googleapiclient.errors import HttpError
 from fastapi import HTTPException
 
 
+# Renew watches 1 day before expiration for safety
+WATCH_RENEWAL_WINDOW_MS = 86_400_000
+
+
 def setup_gmail_watch(service, topic_name: str = None):
     """
     Set up Gmail push notifications for a user.
@@ -83,10 +88,7 @@ def calculate_renewal_time(expiration_ms: int) -> datetime:
     Returns:
         datetime when renewal should happen
     """
-    expiration_dt = datetime.fromtimestamp(expiration_ms / 1000)
-    # Renew 1 day before expiration for safety
-    renewal_dt = expiration_dt - timedelta(days=1)
-    return renewal_dt
+    return datetime.fromtimestamp((expiration_ms - WATCH_RENEWAL_WINDOW_MS) / 1000)
 
 
 def should_renew_watch(expiration_ms: int) -> bool:
@@ -99,5 +101,4 @@ def should_renew_watch(expiration_ms: int) -> bool:
     Returns:
         True if watch should be renewed
     """
-    renewal_time = calculate_renewal_time(expiration_ms)
-    return datetime.now() >= renewal_time
+    return time.time() * 1000 >= expiration_ms - WATCH_RENEWAL_WINDOW_MS
@@ -7,8 +7,17 @@ It searches for company information online and extracts relevant attributes.
 
 import os
 import re
-import requests
+import asyncio
+import threading
 import time
+import weakref
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from urllib.parse import quote_plus
 import logging
@@ -17,6 +26,109 @@ from app.config import GOOGLE_CUSTOM_SEARCH_API_KEY, GOOGLE_CUSTOM_SEARCH_ENGINE
 
 logger = logging.getLogger(__name__)
 
+# Search results per (company name, max results); the same billers recur
+# across invoices, so repeat lookups skip the four API calls
+SEARCH_CACHE_SIZE = 1024
+SEARCH_CACHE_TTL = 86400  # seconds
+
+# Domain extensions accepted for a company's official website
+OFFICIAL_DOMAIN_PATTERN = re.compile(r'\.(?:com|org|net)')
+
+# Terms (in lowercased text) that earn an attribute a specificity bonus; one
+# alternation scan instead of a substring scan per term
+ADDRESS_SPECIFIC_TERMS = re.compile(r'billing|corporate|headquarters')
+PHONE_SPECIFIC_TERMS = re.compile(r'billing|customer service|support')
+EMAIL_SPECIFIC_TERMS = re.compile(r'billing|support|customer')
+
+# Async searches: Custom Search requests in flight per event loop, and retries
+# (exponential backoff from SEARCH_BACKOFF_FACTOR seconds) for these statuses
+GOOGLE_SEARCH_CONCURRENCY = 8
+SEARCH_MAX_RETRIES = 3
+SEARCH_BACKOFF_FACTOR = 0.3
+SEARCH_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# One limit per event loop: a Semaphore binds to the first loop that waits on
+# it, and background tasks run their own loops
+_search_semaphores: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _get_search_semaphore() -> asyncio.Semaphore:
+    """Get the running event loop's search concurrency limit, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    semaphore = _search_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _search_semaphores[loop] = asyncio.Semaphore(GOOGLE_SEARCH_CONCURRENCY)
+    return semaphore
+
+# Extracted attributes per (result text, links, company name)
+ATTRIBUTE_CACHE_SIZE = 1024
+
+# Extraction input caps. Snippets are ~160 chars each, so these only trim
+# oversized result sets; pattern cost grows with the text scanned
+MAX_SCAN_CHARS = 8192
+MAX_SCAN_WEBSITES = 10
+
+# Compiled domain-variation patterns per lowercased company name
+DOMAIN_VARIATION_CACHE_SIZE = 2048
+
+# Attribute patterns, tried in order (specific labels first), compiled once
+
+# Billing address patterns. Written as \d+\s[A-Za-z\s]+ and ,[A-Za-z\s]+ (same
+# matches as \s+[A-Za-z\s]+ / ,\s*[A-Za-z\s]+) so no two adjacent quantifiers
+# compete for whitespace, which backtracks quadratically over long space runs
+ADDRESS_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    # Official billing address patterns
+    r'Billing Address[:\s]+([^,\n]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Way|Place|Pl)[^,\n]*(?:,[A-Za-z\s]+)*)',
+    r'Corporate Address[:\s]+([^,\n]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Way|Place|Pl)[^,\n]*(?:,[A-Za-z\s]+)*)',
+    r'Headquarters[:\s]+([^,\n]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Way|Place|Pl)[^,\n]*(?:,[A-Za-z\s]+)*)',
+    # Standard address patterns
+    r'\b\d+\s[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Way|Place|Pl)\b[^,\n]*(?:,[A-Za-z\s]+)*',
+))
+
+# Phone number patterns
+PHONE_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    # Customer service and billing specific
+    r'Customer Service[:\s]+(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})',
+    r'Billing Support[:\s]+(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})',
+    r'Billing Phone[:\s]+(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})',
+    r'Phone[:\s]+(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})',
+    r'Tel[:\s]+(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})',
+    # General phone patterns
+    r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
+    r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',
+))
+
+# Email address patterns
+EMAIL_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    # Billing and customer service specific
+    r'Billing Email[:\s]+([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',
+    r'Customer Service[:\s]+([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',
+    r'Billing Support[:\s]+([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',
+    r'Contact Email[:\s]+([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',
+    r'Email[:\s]+([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',
+    # General email patterns
+    r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+))
+
+
+@lru_cache(maxsize=DOMAIN_VARIATION_CACHE_SIZE)
+def _domain_variation_pattern(name: str) -> re.Pattern:
+    """
+    Pattern matching any domain spelling of a lowercased company name.
+    
+    Built once per company; one scan per URL for all variations instead of
+    nested substring checks.
+    """
+    nospace = name.replace(' ', '')
+    company_domain_variations = [
+        nospace.replace('inc', '').replace('llc', '').replace('corp', '').replace('ltd', ''),
+        nospace,
+        name.replace(' ', '-'),
+        name.replace(' ', '.')
+    ]
+    return re.compile('|'.join(map(re.escape, company_domain_variations)))
+
+
 class GoogleSearchService:
     """Service for Google Custom Search API operations."""
     
@@ -24,7 +136,26 @@ class GoogleSearchService:
         self.api_key = GOOGLE_CUSTOM_SEARCH_API_KEY
         self.search_engine_id = GOOGLE_CUSTOM_SEARCH_ENGINE_ID
         self.base_url = "https://www.googleapis.com/customsearch/v1"
-        self.rate_limit_delay = 1.0  # Delay between requests to respect rate limits
+        self._search_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._search_cache_lock = threading.Lock()
+        
+        # Long-lived keep-alive client per event loop for the async searches (an
+        # AsyncClient cannot be shared across loops, and background tasks run their own)
+        self._async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        
+        # Keep-alive connections shared by the concurrent queries; rate-limited
+        # (429) and transient 5xx responses are retried with exponential backoff
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=SEARCH_MAX_RETRIES,
+                backoff_factor=SEARCH_BACKOFF_FACTOR,
+                status_forcelist=sorted(SEARCH_RETRY_STATUSES),
+                raise_on_status=False
+            )
+        ))
         
         if not self.api_key or not self.search_engine_id:
             logger.warning("Google Custom Search API credentials not configured")
@@ -32,6 +163,7 @@ class GoogleSearchService:
     def search_company_info(self, company_name: str, max_results: int = 10) -> Dict[str, Any]:
         """
         Search for company information using Google Custom Search API.
+        Results are cached per company for SEARCH_CACHE_TTL seconds.
         
         Args:
             company_name (str): Company name to search for
@@ -44,62 +176,185 @@ class GoogleSearchService:
             logger.error("Google Custom Search API credentials not configured")
             return self._get_mock_results(company_name)
         
-        # Construct specific search queries for deterministic company information
-        search_queries = [
+        cached = self._get_cached_search(company_name, max_results)
+        if cached is not None:
+            return cached
+        
+        search_queries = self._search_queries(company_name)
+        num = min(max_results // len(search_queries), 3)  # Distribute results across queries
+        
+        # Run the queries concurrently; results are combined in query order
+        with ThreadPoolExecutor(max_workers=len(search_queries)) as executor:
+            responses = list(executor.map(
+                lambda search_query: self._run_search_query(search_query, num),
+                search_queries
+            ))
+        
+        return self._combine_search_responses(company_name, max_results, responses)
+    
+    async def search_company_info_async(self, company_name: str, max_results: int = 10) -> Dict[str, Any]:
+        """
+        Async variant of search_company_info for use on the event loop.
+        
+        Queries run concurrently over httpx, limited process-wide to
+        GOOGLE_SEARCH_CONCURRENCY requests; rate-limit backoff does not block the loop.
+        
+        Args:
+            company_name (str): Company name to search for
+            max_results (int): Maximum number of results to return
+            
+        Returns:
+            Dict[str, Any]: Search results with metadata
+        """
+        if not self.api_key or not self.search_engine_id:
+            logger.error("Google Custom Search API credentials not configured")
+            return self._get_mock_results(company_name)
+        
+        cached = self._get_cached_search(company_name, max_results)
+        if cached is not None:
+            return cached
+        
+        search_queries = self._search_queries(company_name)
+        num = min(max_results // len(search_queries), 3)  # Distribute results across queries
+        
+        client = self._get_async_client()
+        responses = await asyncio.gather(*(
+            self._run_search_query_async(client, search_query, num)
+            for search_query in search_queries
+        ))
+        
+        return self._combine_search_responses(company_name, max_results, responses)
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Get the running event loop's search HTTP client, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(timeout=10)
+            self._async_clients[loop] = client
+        return client
+    
+    async def close_async_client(self):
+        """Close the running event loop's search HTTP client, if one was created."""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+    
+    @staticmethod
+    def _search_queries(company_name: str) -> List[str]:
+        """Construct specific search queries for deterministic company information."""
+        return [
             f'"{company_name}" official billing address contact information',
             f'"{company_name}" customer service phone number billing',
             f'"{company_name}" billing department email contact',
             f'"{company_name}" corporate headquarters address phone'
         ]
-        
+    
+    def _search_params(self, search_query: str, num: int) -> Dict[str, Any]:
+        return {
+            'key': self.api_key,
+            'cx': self.search_engine_id,
+            'q': search_query,
+            'num': num,
+            'safe': 'medium',
+            'fields': 'items(title,snippet,link),searchInformation(totalResults)'
+        }
+    
+    def _get_cached_search(self, company_name: str, max_results: int) -> Optional[Dict[str, Any]]:
+        """Return a copy of cached search results that are still fresh, else None."""
+        cache_key = (company_name.lower(), max_results)
+        with self._search_cache_lock:
+            cached = self._search_cache.get(cache_key)
+            if cached and time.monotonic() - cached[1] < SEARCH_CACHE_TTL:
+                self._search_cache.move_to_end(cache_key)
+                return dict(cached[0])
+        return None
+    
+    def _combine_search_responses(self, company_name: str, max_results: int,
+                                  responses: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Merge per-query API responses (None for failed queries) and cache the result."""
         all_results = []
         total_results = 0
-        
-        for search_query in search_queries:
-            try:
-                params = {
-                    'key': self.api_key,
-                    'cx': self.search_engine_id,
-                    'q': search_query,
-                    'num': min(max_results // len(search_queries), 3),  # Distribute results across queries
-                    'safe': 'medium',
-                    'fields': 'items(title,snippet,link),searchInformation(totalResults)'
-                }
-                
-                logger.info(f"Searching for: {search_query}")
-                response = requests.get(self.base_url, params=params, timeout=10)
-                response.raise_for_status()
-                
-                data = response.json()
-                items = data.get('items', [])
-                all_results.extend(items)
-                total_results += int(data.get('searchInformation', {}).get('totalResults', '0'))
-                
-                # Add rate limiting delay between requests
-                time.sleep(self.rate_limit_delay)
-                
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Google Search API request failed for '{search_query}': {str(e)}")
-                continue
-            except Exception as e:
-                logger.error(f"Unexpected error in Google Search for '{search_query}': {str(e)}")
+        for data in responses:
+            if data is None:
                 continue
+            all_results.extend(data.get('items', []))
+            total_results += int(data.get('searchInformation', {}).get('totalResults', '0'))
         
-        # Remove duplicates based on link
-        seen_links = set()
-        unique_results = []
+        # Remove duplicates based on link (first result per link, in order)
+        results_by_link = {}
         for item in all_results:
-            if item.get('link') not in seen_links:
-                seen_links.add(item.get('link'))
-                unique_results.append(item)
+            results_by_link.setdefault(item.get('link'), item)
+        unique_results = list(results_by_link.values())
         
-        return {
+        results = {
             'success': True,
             'query': f"Multiple targeted searches for {company_name}",
             'total_results': str(total_results),
             'items': unique_results[:max_results],  # Limit final results
             'error': None
         }
+        
+        # Only cache when at least one query got through
+        if any(data is not None for data in responses):
+            cache_key = (company_name.lower(), max_results)
+            with self._search_cache_lock:
+                self._search_cache[cache_key] = (results, time.monotonic())
+                self._search_cache.move_to_end(cache_key)
+                if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                    self._search_cache.popitem(last=False)
+        
+        return dict(results)
+    
+    def _run_search_query(self, search_query: str, num: int) -> Optional[Dict[str, Any]]:
+        """
+        Run one Custom Search query.
+        
+        Returns:
+            Optional[Dict[str, Any]]: API response, or None if the request failed
+        """
+        params = self._search_params(search_query, num)
+        
+        try:
+            logger.info(f"Searching for: {search_query}")
+            response = self.session.get(self.base_url, params=params, timeout=10)
+            response.raise_for_status()
+            return response.json()
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Google Search API request failed for '{search_query}': {str(e)}")
+        except Exception as e:
+            logger.error(f"Unexpected error in Google Search for '{search_query}': {str(e)}")
+        return None
+    
+    async def _run_search_query_async(self, client: httpx.AsyncClient, search_query: str,
+                                      num: int) -> Optional[Dict[str, Any]]:
+        """
+        Run one Custom Search query on the event loop, retrying rate-limited (429)
+        and transient 5xx responses with exponential backoff.
+        
+        Returns:
+            Optional[Dict[str, Any]]: API response, or None if the request failed
+        """
+        params = self._search_params(search_query, num)
+        semaphore = _get_search_semaphore()
+        
+        try:
+            logger.info(f"Searching for: {search_query}")
+            for attempt in range(SEARCH_MAX_RETRIES + 1):
+                async with semaphore:
+                    response = await client.get(self.base_url, params=params)
+                if response.status_code not in SEARCH_RETRY_STATUSES or attempt == SEARCH_MAX_RETRIES:
+                    break
+                await asyncio.sleep(SEARCH_BACKOFF_FACTOR * 2 ** attempt)
+            response.raise_for_status()
+            return response.json()
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Google Search API request failed for '{search_query}': {str(e)}")
+        except Exception as e:
+            logger.error(f"Unexpected error in Google Search for '{search_query}': {str(e)}")
+        return None
     
     def extract_company_attributes(self, search_results: Dict[str, Any], company_name: str) -> Dict[str, Any]:
         """
@@ -122,102 +377,63 @@ class GoogleSearchService:
                 'extraction_method': 'no_results'
             }
         
-        extracted_attributes = {
-            'billing_address': None,
-            'phone_number': None,
-            'email': None,
-            'website': None,
-            'confidence': 0.0,
-            'extraction_method': 'search_results'
-        }
-        
         # Combine all snippets and titles for extraction
-        combined_text = ""
+        text_parts = []
         websites = []
         
         for item in search_results['items']:
-            title = item.get('title', '')
-            snippet = item.get('snippet', '')
+            text_parts.append(item.get('title', ''))
+            text_parts.append(item.get('snippet', ''))
             link = item.get('link', '')
-            
-            combined_text += f" {title} {snippet}"
             if link:
                 websites.append(link)
         
-        # Extract billing address with more specific patterns
-        address_patterns = [
-            # Official billing address patterns
-            r'Billing Address[:\s]+([^,\n]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Way|Place|Pl)[^,\n]*(?:,\s*[A-Za-z\s]+)*)',
-            r'Corporate Address[:\s]+([^,\n]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Way|Place|Pl)[^,\n]*(?:,\s*[A-Za-z\s]+)*)',
-            r'Headquarters[:\s]+([^,\n]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Way|Place|Pl)[^,\n]*(?:,\s*[A-Za-z\s]+)*)',
-            # Standard address patterns
-            r'\b\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Way|Place|Pl)\b[^,\n]*(?:,\s*[A-Za-z\s]+)*',
-        ]
-        
-        for pattern in address_patterns:
-            match = re.search(pattern, combined_text, re.IGNORECASE)
-            if match:
-                # Use group(1) if it exists, otherwise use group(0)
-                extracted_attributes['billing_address'] = (match.group(1) if match.groups() else match.group(0)).strip()
-                break
-        
-        # Extract phone number with more specific patterns
-        phone_patterns = [
-            # Customer service and billing specific
-            r'Customer Service[:\s]+(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})',
-            r'Billing Support[:\s]+(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})',
-            r'Billing Phone[:\s]+(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})',
-            r'Phone[:\s]+(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})',
-            r'Tel[:\s]+(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})',
-            # General phone patterns
-            r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',
-        ]
+        # Bound regex work (and cache keys) regardless of how many results come back
+        combined_text = " ".join(text_parts)[:MAX_SCAN_CHARS]
+        websites = websites[:MAX_SCAN_WEBSITES]
         
-        for pattern in phone_patterns:
-            match = re.search(pattern, combined_text)
-            if match:
-                # Use group(1) if it exists, otherwise use group(0)
-                extracted_attributes['phone_number'] = (match.group(1) if match.groups() else match.group(0)).strip()
-                break
-        
-        # Extract email address with more specific patterns
-        email_patterns = [
-            # Billing and customer service specific
-            r'Billing Email[:\s]+([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',
-            r'Customer Service[:\s]+([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',
-            r'Billing Support[:\s]+([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',
-            r'Contact Email[:\s]+([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',
-            r'Email[:\s]+([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})',
-            # General email patterns
-            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-        ]
+        # Identical result sets (cached searches, repeat billers) skip the regex work
+        return dict(self._extract_from_text(combined_text, tuple(websites), company_name))
+    
+    @staticmethod
+    @lru_cache(maxsize=ATTRIBUTE_CACHE_SIZE)
+    def _extract_from_text(combined_text: str, websites: tuple, company_name: str) -> Dict[str, Any]:
+        """Extract company attributes from combined result text and result links."""
+        extracted_attributes = {
+            'billing_address': None,
+            'phone_number': None,
+            'email': None,
+            'website': None,
+            'confidence': 0.0,
+            'extraction_method': 'search_results'
+        }
         
-        for pattern in email_patterns:
-            match = re.search(pattern, combined_text, re.IGNORECASE)
-            if match:
-                # Use group(1) if it exists, otherwise use group(0)
-                extracted_attributes['email'] = (match.group(1) if match.groups() else match.group(0)).strip()
-                break
+        # Extract billing address, phone number and email with the most specific
+        # pattern that matches; fields already filled are skipped
+        for field, patterns in (
+            ('billing_address', ADDRESS_PATTERNS),
+            ('phone_number', PHONE_PATTERNS),
+            ('email', EMAIL_PATTERNS)
+        ):
+            if extracted_attributes[field]:
+                continue
+            for pattern in patterns:
+                match = pattern.search(combined_text)
+                if match:
+                    # Use group(1) if it exists, otherwise use group(0)
+                    extracted_attributes[field] = (match.group(1) if match.groups() else match.group(0)).strip()
+                    break
         
         # Extract website (prioritize official company website)
         if websites:
             # Look for official company website with higher priority
-            company_domain_variations = [
-                company_name.lower().replace(' ', '').replace('inc', '').replace('llc', '').replace('corp', '').replace('ltd', ''),
-                company_name.lower().replace(' ', ''),
-                company_name.lower().replace(' ', '-'),
-                company_name.lower().replace(' ', '.')
-            ]
+            domain_variation_pattern = _domain_variation_pattern(company_name.lower())
             
             official_website = None
             for website in websites:
                 website_lower = website.lower()
-                for domain_var in company_domain_variations:
-                    if domain_var in website_lower and any(ext in website_lower for ext in ['.com', '.org', '.net']):
-                        official_website = website
-                        break
-                if official_website:
+                if domain_variation_pattern.search(website_lower) and OFFICIAL_DOMAIN_PATTERN.search(website_lower):
+                    official_website = website
                     break
             
             extracted_attributes['website'] = official_website or websites[0]
@@ -232,25 +448,28 @@ class GoogleSearchService:
         if extracted_attributes['billing_address']:
             confidence_score += 0.25
             # Bonus for official billing address patterns
-            if any(term in extracted_attributes['billing_address'].lower() for term in ['billing', 'corporate', 'headquarters']):
+            address_lower = extracted_attributes['billing_address'].lower()
+            if ADDRESS_SPECIFIC_TERMS.search(address_lower):
                 specificity_bonus += 0.1
         
         if extracted_attributes['phone_number']:
             confidence_score += 0.25
             # Bonus for billing-specific phone patterns
-            if any(term in combined_text.lower() for term in ['billing', 'customer service', 'support']):
+            combined_lower = combined_text.lower()  # once, not per term
+            if PHONE_SPECIFIC_TERMS.search(combined_lower):
                 specificity_bonus += 0.1
         
         if extracted_attributes['email']:
             confidence_score += 0.2
             # Bonus for billing-specific email patterns
-            if any(term in extracted_attributes['email'].lower() for term in ['billing', 'support', 'customer']):
+            email_lower = extracted_attributes['email'].lower()
+            if EMAIL_SPECIFIC_TERMS.search(email_lower):
                 specificity_bonus += 0.1
         
         if extracted_attributes['website']:
             confidence_score += 0.2
             # Bonus for official company website
-            if any(domain_var in extracted_attributes['website'].lower() for domain_var in company_domain_variations):
+            if domain_variation_pattern.search(extracted_attributes['website'].lower()):
                 specificity_bonus += 0.1
         
         # Apply specificity bonus
@@ -1,45 +1,51 @@
 import os
 import json
 import re
-from typing import Dict
+from typing import Dict, Optional
 from google import genai
 
 
-def extract_invoice_data(email_body: str, attachment_text: str, sender: str) -> Dict:
-    """
-    Extract structured invoice data from email and attachments using Gemini AI.
-    
-    Args:
-        email_body: Email body text
-        attachment_text: Extracted text from PDF attachments
-        sender: Sender email address
-        
-    Returns:
-        dict with extracted invoice data
-    """
-    gemini_key = os.getenv("GEMINI_API_KEY")
-    if not gemini_key:
-        print("⚠️  GEMINI_API_KEY not set, using fallback extraction")
-        return fallback_extract_invoice_data(email_body, attachment_text, sender)
-    
-    try:
-        client = genai.Client(
-            api_key=gemini_key,
-            http_options={'api_version': 'v1alpha'}
-        )
-        
-        # Combine email and attachment text
-        full_content = f"""EMAIL BODY:
-{email_body[:3000]}
+# Fallback extraction patterns, tried in order and compiled once
+SENDER_EMAIL_PATTERN = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
 
-ATTACHMENT CONTENT:
-{attachment_text[:5000]}
+PHONE_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'\+?[\d\s\-\(\)]{10,}',
+    r'\d{3}[-\.\s]?\d{3}[-\.\s]?\d{4}',
+    r'\+\d{1,3}\s?\d{3,}'
+))
 
-SENDER: {sender}"""
-        
-        prompt = f"""Extract invoice/billing information from this email and its attachments.
+INVOICE_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'invoice\s*#?\s*:?\s*([A-Z0-9\-]+)',
+    r'reference\s*#?\s*:?\s*([A-Z0-9\-]+)',
+    r'bill\s*#?\s*:?\s*([A-Z0-9\-]+)'
+))
 
-{full_content}
+ACCOUNT_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'account\s*#?\s*:?\s*([A-Z0-9\-]+)',
+    r'customer\s*#?\s*:?\s*([A-Z0-9\-]+)',
+    r'client\s*#?\s*:?\s*([A-Z0-9\-]+)'
+))
+
+# Priority order: any currency amount anywhere beats a "total"/"amount" label, so
+# these cannot become one alternation (it returns the leftmost match instead).
+# Separate searches are also faster: each pattern keeps re's literal-prefix scan,
+# which a fused pattern loses
+AMOUNT_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'[\$£€]\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
+    r'total[:\s]+[\$£€]?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
+    r'amount[:\s]+[\$£€]?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)'
+))
+
+# Gemini prompt (str.format template; literal braces are doubled)
+INVOICE_EXTRACTION_PROMPT = """Extract invoice/billing information from this email and its attachments.
+
+EMAIL BODY:
+{email_body}
+
+ATTACHMENT CONTENT:
+{attachment_text}
+
+SENDER: {sender}
 
 Extract the following fields (use empty string "" if not found, except amount which should be 0.0):
 
@@ -70,6 +76,49 @@ Return ONLY valid JSON (no markdown, no explanation):
   "invoice_number": "INV-2025-001",
   "amount": 150.50
 }}"""
+
+
+_genai_client: Optional[genai.Client] = None
+_genai_client_key: Optional[str] = None
+
+
+def _get_genai_client(api_key: str) -> genai.Client:
+    """Get the shared Gemini client, so its connections are reused across invoices."""
+    global _genai_client, _genai_client_key
+    if _genai_client is None or _genai_client_key != api_key:
+        _genai_client = genai.Client(
+            api_key=api_key,
+            http_options={'api_version': 'v1alpha'}
+        )
+        _genai_client_key = api_key
+    return _genai_client
+
+
+def extract_invoice_data(email_body: str, attachment_text: str, sender: str) -> Dict:
+    """
+    Extract structured invoice data from email and attachments using Gemini AI.
+    
+    Args:
+        email_body: Email body text
+        attachment_text: Extracted text from PDF attachments
+        sender: Sender email address
+        
+    Returns:
+        dict with extracted invoice data
+    """
+    gemini_key = os.getenv("GEMINI_API_KEY")
+    if not gemini_key:
+        print("⚠️  GEMINI_API_KEY not set, using fallback extraction")
+        return fallback_extract_invoice_data(email_body, attachment_text, sender)
+    
+    try:
+        client = _get_genai_client(gemini_key)
+        
+        prompt = INVOICE_EXTRACTION_PROMPT.format(
+            email_body=email_body[:3000],
+            attachment_text=attachment_text[:5000],
+            sender=sender
+        )
         
         response = client.models.generate_content(
             model='gemini-2.0-flash-exp',
@@ -78,22 +127,14 @@ Return ONLY valid JSON (no markdown, no explanation):
         
         response_text = response.text
         
-        # Extract JSON from response
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_match:
-            extracted_data = json.loads(json_match.group())
+        # Extract JSON from response (first '{' to last '}')
+        start = response_text.find('{')
+        end = response_text.rfind('}')
+        if start != -1 and end > start:
+            extracted_data = json.loads(response_text[start:end + 1])
         else:
             extracted_data = json.loads(response_text)
         
-        # Cleanup client
-        try:
-            import asyncio
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                asyncio.create_task(client.aclose())
-        except:
-            pass
-        
         return extracted_data
         
     except Exception as e:
@@ -108,64 +149,41 @@ def fallback_extract_invoice_data(email_body: str, attachment_text: str, sender:
     combined_text = f"{email_body} {attachment_text}"
     
     # Extract email from sender
-    email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', sender)
+    email_match = SENDER_EMAIL_PATTERN.search(sender)
     contact_email = email_match.group() if email_match else ''
     
     # Try to extract phone number
-    phone_patterns = [
-        r'\+?[\d\s\-\(\)]{10,}',
-        r'\d{3}[-\.\s]?\d{3}[-\.\s]?\d{4}',
-        r'\+\d{1,3}\s?\d{3,}'
-    ]
     phone_number = ''
-    for pattern in phone_patterns:
-        match = re.search(pattern, combined_text)
+    for pattern in PHONE_PATTERNS:
+        match = pattern.search(combined_text)
         if match:
             phone_number = match.group().strip()
             break
     
     # Try to extract invoice number
-    invoice_patterns = [
-        r'invoice\s*#?\s*:?\s*([A-Z0-9\-]+)',
-        r'reference\s*#?\s*:?\s*([A-Z0-9\-]+)',
-        r'bill\s*#?\s*:?\s*([A-Z0-9\-]+)'
-    ]
     invoice_number = ''
-    for pattern in invoice_patterns:
-        match = re.search(pattern, combined_text, re.IGNORECASE)
+    for pattern in INVOICE_PATTERNS:
+        match = pattern.search(combined_text)
         if match:
             invoice_number = match.group(1)
             break
     
     # Try to extract account number
-    account_patterns = [
-        r'account\s*#?\s*:?\s*([A-Z0-9\-]+)',
-        r'customer\s*#?\s*:?\s*([A-Z0-9\-]+)',
-        r'client\s*#?\s*:?\s*([A-Z0-9\-]+)'
-    ]
     account_number = ''
-    for pattern in account_patterns:
-        match = re.search(pattern, combined_text, re.IGNORECASE)
+    for pattern in ACCOUNT_PATTERNS:
+        match = pattern.search(combined_text)
         if match:
             account_number = f"Account: {match.group(1)}"
             break
     
     # Try to extract amount
-    amount_patterns = [
-        r'[\$£€]\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-        r'total[:\s]+[\$£€]?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-        r'amount[:\s]+[\$£€]?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)'
-    ]
     amount = 0.0
-    for pattern in amount_patterns:
-        match = re.search(pattern, combined_text, re.IGNORECASE)
+    for pattern in AMOUNT_PATTERNS:
+        match = pattern.search(combined_text)
         if match:
-            amount_str = match.group(1).replace(',', '')
-            try:
-                amount = float(amount_str)
-                break
-            except:
-                pass
+            # The captured digits/commas/decimals always parse once commas are removed
+            amount = float(match.group(1).replace(',', ''))
+            break
     
     return {
         'billing_address': '',
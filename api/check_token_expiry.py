@@ -3,17 +3,63 @@
 
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
-from supabase import create_client
 
 # Load environment
 load_dotenv()
 
-supabase = create_client(
-    os.getenv("SUPABASE_URL"),
-    os.getenv("SUPABASE_SERVICE_KEY")
-)
+from app.database.supabase_client import get_supabase_client
+
+# Google access tokens live for an hour; refresh once less than
+# max(REFRESH_MIN_SKEW, REFRESH_LIFETIME_FRACTION of that) remains
+TOKEN_LIFETIME = timedelta(hours=1)
+REFRESH_MIN_SKEW = timedelta(minutes=5)
+REFRESH_LIFETIME_FRACTION = 0.15
+
+
+def should_refresh(expires_at: datetime, now: datetime, lifetime: timedelta = TOKEN_LIFETIME) -> bool:
+    """Whether a token expiring at expires_at should be refreshed now, before it expires."""
+    return expires_at - now < max(REFRESH_MIN_SKEW, lifetime * REFRESH_LIFETIME_FRACTION)
+
+
+def parse_expiry(value: str) -> datetime:
+    """Parse a stored token expiry as an aware UTC datetime (naive values are UTC)."""
+    # Supabase returns ISO 8601 timestamps
+    expires_at = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at
+
+
+def refresh_access_token(supabase, user_id: str, token_data: dict):
+    """
+    Refresh the user's Google access token and store it with its new expiry.
+    
+    Args:
+        supabase: Supabase client the token row is updated through
+        user_id: User whose Google token is refreshed
+        token_data: The user's user_oauth_tokens row
+    
+    Returns:
+        The new expiry (naive UTC, as google-auth reports it)
+    """
+    from app.services.gmail_service import create_gmail_service
+    
+    _, creds = create_gmail_service(
+        token_data['access_token'],
+        token_data['refresh_token'],
+        attempt_refresh=True
+    )
+    supabase.table('user_oauth_tokens').update({
+        'access_token': creds.token,
+        'token_expires_at': creds.expiry.isoformat() + '+00:00' if creds.expiry else None,
+        'updated_at': datetime.now().isoformat()
+    }).eq('user_id', user_id).eq('provider', 'google').execute()
+    return creds.expiry
+
+
+supabase = get_supabase_client()
 
 user_id = sys.argv[1] if len(sys.argv) > 1 else 'a33138b1-09c3-43ec-a1f2-af3bebed78b7'
 
@@ -44,16 +90,8 @@ if token_data.get('refresh_token'):
 # Check expiration
 if token_data.get('token_expires_at'):
     try:
-        from dateutil import parser as date_parser
-        expires_at = date_parser.parse(token_data['token_expires_at'])
-        now = datetime.now(expires_at.tzinfo) if expires_at.tzinfo else datetime.now()
-        
-        # Make timezone-aware if needed
-        if not now.tzinfo and expires_at.tzinfo:
-            import pytz
-            now = pytz.UTC.localize(now)
-        elif now.tzinfo and not expires_at.tzinfo:
-            expires_at = pytz.UTC.localize(expires_at)
+        expires_at = parse_expiry(token_data['token_expires_at'])
+        now = datetime.now(timezone.utc)
         
         time_until_expiry = expires_at - now
         
@@ -70,13 +108,23 @@ if token_data.get('token_expires_at'):
             
             if minutes < 10:
                 print(f"\n⚠️  WARNING: Token expires in less than 10 minutes!")
-                print(f"   Auto-refresh will happen on next API call")
         else:
             minutes_ago = int(abs(time_until_expiry.total_seconds()) / 60)
             print(f"❌ Status: EXPIRED")
             print(f"⏱️  Expired: {minutes_ago} minutes ago")
             print(f"📅 Expired At: {expires_at}")
-            print(f"\n🔄 Auto-refresh will happen on next API call")
+        
+        # Refresh ahead of expiry so the next API call does not hit a 401 first
+        if should_refresh(expires_at, now):
+            if token_data.get('refresh_token'):
+                print("\n🔄 Refreshing access token before it expires...")
+                try:
+                    new_expiry = refresh_access_token(supabase, user_id, token_data)
+                    print(f"✅ Token refreshed, new expiry: {new_expiry} UTC")
+                except Exception as e:
+                    print(f"❌ Token refresh failed: {e}")
+            else:
+                print("\n❌ Token needs refreshing but no refresh token is stored")
             
     except Exception as e:
         print(f"\n⚠️  Could not parse expiration: {e}")
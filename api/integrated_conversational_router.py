@@ -6,11 +6,19 @@ import os
 import json
 import time
 import requests
+from requests.adapters import HTTPAdapter
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/call", tags=["conversational-calling"])
 
+# Separators stripped from phone numbers in one translate pass
+PHONE_FORMATTING_CHARS = str.maketrans('', '', ' -()')
+
+# Keep-alive connections to ElevenLabs shared by all call and status requests
+elevenlabs_session = requests.Session()
+elevenlabs_session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=32))
+
 class CallRequest(BaseModel):
     phone_number: str
     company_name: str
@@ -30,7 +38,7 @@ async def make_conversational_call(request: CallRequest):
             raise HTTPException(status_code=500, detail="ElevenLabs API key not configured")
         
         # Format phone number
-        phone = request.phone_number.strip().replace(" ", "").replace("-", "").replace("(", "").replace(")", "")
+        phone = request.phone_number.strip().translate(PHONE_FORMATTING_CHARS)
         if not phone.startswith("+"):
             if phone.startswith("1") and len(phone) == 11:
                 phone = "+" + phone
@@ -69,7 +77,7 @@ async def make_conversational_call(request: CallRequest):
         print(f"   Payload: {json.dumps(call_payload, indent=2)}")
         
         # Make the API call
-        response = requests.post(url, headers=headers, json=call_payload, timeout=30)
+        response = elevenlabs_session.post(url, headers=headers, json=call_payload, timeout=30)
         
         print(f"\n📋 Response Status: {response.status_code}")
         print(f"   Response Headers: {dict(response.headers)}")
@@ -137,7 +145,7 @@ async def get_call_status(conversation_id: str):
         url = f"https://api.elevenlabs.io/v1/convai/conversations/{conversation_id}"
         headers = {"xi-api-key": elevenlabs_api_key}
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = elevenlabs_session.get(url, headers=headers, timeout=10)
         
         if response.status_code == 200:
             return response.json()
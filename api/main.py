@@ -1,6 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import ALLOWED_ORIGINS
+from app.database.supabase_client import get_supabase_client
+from app.services.fraud_logger import get_fraud_log_wal
+from app.services.gmail_service import shutdown_email_process_pool
+from app.services.gmail_async import close_client as close_gmail_http_client
+from app.services.google_search_service import google_search_service
 from app.routers import emails_router, health_router, oauth_router
 from app.routers.gmail_watch import router as gmail_watch_router
 from app.routers.pubsub import router as pubsub_router
@@ -29,6 +34,41 @@ app.include_router(gmail_watch_router)
 app.include_router(pubsub_router)
 app.include_router(call_router)
 
+
+@app.on_event("startup")
+async def start_fraud_log_shipper():
+    """Replay and ship the fraud log WAL to Supabase when it is enabled."""
+    wal = get_fraud_log_wal()
+    if wal is not None:
+        wal.start_shipper(get_supabase_client())
+
+
+@app.on_event("shutdown")
+async def stop_fraud_log_shipper():
+    """Ship any remaining fraud log WAL entries before exiting."""
+    wal = get_fraud_log_wal()
+    if wal is not None:
+        await wal.stop_shipper()
+
+
+@app.on_event("shutdown")
+async def stop_email_process_pool():
+    """Stop the email body processing worker processes."""
+    shutdown_email_process_pool()
+
+
+@app.on_event("shutdown")
+async def close_gmail_client():
+    """Close the keep-alive Gmail HTTP client."""
+    await close_gmail_http_client()
+
+
+@app.on_event("shutdown")
+async def close_google_search_client():
+    """Close the keep-alive Google Custom Search HTTP client."""
+    await google_search_service.close_async_client()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
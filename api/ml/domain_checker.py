@@ -478,11 +478,13 @@ async def verify_company_against_database(
         supabase = get_supabase_client()
         
         # Search for companies by user_id and name similarity
-        companies_result = supabase.table('companies')\
-            .select('*')\
-            .eq('user_id', user_uuid)\
-            .ilike('name', f'%{company_name}%')\
-            .execute()
+        companies_result = await asyncio.to_thread(
+            supabase.table('companies')
+            .select('*')
+            .eq('user_id', user_uuid)
+            .ilike('name', f'%{company_name}%')
+            .execute
+        )
         
         if not companies_result.data:
             # No matching company found - perform online verification
@@ -656,7 +658,7 @@ async def verify_company_online(
         supabase = get_supabase_client()
         
         # Perform actual Google Search API call
-        search_response = google_search_service.search_company_info(company_name)
+        search_response = await google_search_service.search_company_info_async(company_name)
         
         # Extract attributes from search results
         extracted_attributes = google_search_service.extract_company_attributes(search_response, company_name)
@@ -894,7 +896,7 @@ async def verify_company_online(
                 'confidence': confidence
             }
             
-            supabase.table('google_search_results').insert(search_data).execute()
+            await asyncio.to_thread(supabase.table('google_search_results').insert(search_data).execute)
         except Exception as e:
             print(f"Warning: Failed to save search results: {e}")
         
@@ -1001,8 +1003,10 @@ async def check_billing_email_legitimacy(
         
         return result
     
-    # Step 2: Classify email type using Gemini AI
-    classification_result = classify_email_type_with_gemini(gmail_msg, user_uuid, fraud_logger)
+    # Step 2: Classify email type using Gemini AI (blocking API call, run off the event loop)
+    classification_result = await asyncio.to_thread(
+        classify_email_type_with_gemini, gmail_msg, user_uuid, fraud_logger
+    )
     all_log_entries.extend(classification_result["log_entries"])
     
     # If not billing-related by Gemini, halt processing
@@ -1057,8 +1061,9 @@ async def check_billing_email_legitimacy(
         
         return result
     
-    # Step 3: Analyze domain legitimacy for bills
-    domain_result = analyze_domain_legitimacy(
+    # Step 3: Analyze domain legitimacy for bills (blocking DNS lookup, run off the event loop)
+    domain_result = await asyncio.to_thread(
+        analyze_domain_legitimacy,
         gmail_msg, 
         classification_result["email_type"], 
         user_uuid, 
@@ -0,0 +1,7 @@
+-- Indexes for the email_fraud_logs read paths in api/app/services/fraud_logger.py
+-- (get_fraud_emails_for_user filters on status and uses idx_fraud_logs_user_status,
+-- added with the typed columns in 20261017000100)
+
+-- get_email_analysis_history / get_final_decision: every step of one email in order
+create index if not exists idx_history
+    on public.email_fraud_logs (email_id, user_uuid, created_at);
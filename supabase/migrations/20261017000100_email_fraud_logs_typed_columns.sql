@@ -0,0 +1,41 @@
+-- Promote hot details fields of email_fraud_logs to typed, indexed columns.
+-- EmailFraudLogger writes them alongside details.
+
+alter table public.email_fraud_logs
+    add column if not exists status text,
+    add column if not exists email_type text,
+    add column if not exists trigger_agent boolean;
+
+-- Backfill existing rows from details
+update public.email_fraud_logs
+set email_type = details->>'email_type',
+    trigger_agent = (details->>'trigger_agent')::boolean
+where email_type is null
+  and trigger_agent is null
+  and (details ? 'email_type' or details ? 'trigger_agent');
+
+-- Final decisions: legit, call (halted but handed to the call agent), not_billing,
+-- pending (legitimate-domain bill awaiting human review) or fraud; same mapping
+-- as EmailFraudLogger.log_final_decision
+update public.email_fraud_logs
+set status = case
+        when decision then 'legit'
+        when coalesce((details->'complete_analysis'->>'trigger_agent')::boolean, false) then 'call'
+        when not coalesce((details->'complete_analysis'->>'is_billing')::boolean, false) then 'not_billing'
+        when details->'complete_analysis'->>'email_type' = 'bill'
+            -- a missing is_legitimate counts as legitimate, an explicit null does not
+            and coalesce(
+                (details->'complete_analysis'->>'is_legitimate')::boolean,
+                not (details->'complete_analysis' ? 'is_legitimate')
+            )
+            and coalesce(details->>'verification_status', 'pending') not in ('legit', 'call')
+            then 'pending'
+        else 'fraud'
+    end,
+    trigger_agent = coalesce((details->'complete_analysis'->>'trigger_agent')::boolean, false)
+where step = 'final_decision'
+  and status is null;
+
+-- get_fraud_emails_for_user and other per-user status lists
+create index if not exists idx_fraud_logs_user_status
+    on public.email_fraud_logs (user_uuid, status, created_at desc);